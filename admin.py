@@ -11,17 +11,12 @@ from discord import app_commands
 import re
 import time
 from bot.utils.helpers import is_mod, cleanup_old_data, active_votes, scoreboards, logger
+from bot.cogs.vc_access import allowed_vcs, vc_access_config
+from bot.cogs.channel_picker import ChannelPickerView
 
 # Store locked VC members (channel_id: [member_ids])
 vc_locked_members = {}
 
-# In-memory config for move permissions
-move_config = {
-    'role_id': None,
-    'channel_ids': set(),
-    'category_ids': set(),
-}
-
 class AdminCog(commands.Cog):
     """Admin and moderation commands (roles, channels, cleanup, etc.)"""
     def __init__(self, bot):
@@ -170,32 +165,16 @@ class AdminCog(commands.Cog):
             await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
             return
 
-        class CategorySelectionView(discord.ui.View):
+        class CategorySelectionView(ChannelPickerView):
             def __init__(self):
-                super().__init__(timeout=300)
+                super().__init__(interaction.guild, "category", "Select a category to delete all channels from...", timeout=300)
                 self.selected_category = None
-                categories = interaction.guild.categories
-                if not categories:
-                    return
-                category_options = []
-                for category in categories:
-                    category_options.append(discord.SelectOption(
-                        label=category.name,
-                        value=str(category.id),
-                        description=f"{len(category.channels)} channels to delete"
-                    ))
-                if category_options:
-                    self.category_select = discord.ui.Select(
-                        placeholder="Select a category to delete all channels from...",
-                        options=category_options[:25],
-                        min_values=1,
-                        max_values=1
-                    )
-                    self.category_select.callback = self.category_callback
-                    self.add_item(self.category_select)
 
-            async def category_callback(self, interaction2: discord.Interaction):
-                self.selected_category = interaction2.data['values'][0]
+            async def on_pick(self, interaction2: discord.Interaction, values):
+                await self.category_callback(interaction2, values[0])
+
+            async def category_callback(self, interaction2: discord.Interaction, value):
+                self.selected_category = value
                 category = interaction.guild.get_channel(int(self.selected_category))
                 if category:
                     channels_to_delete = []
@@ -285,7 +264,7 @@ class AdminCog(commands.Cog):
                 await interaction3.response.send_message("❌ Channel deletion cancelled. No channels were deleted.", ephemeral=True)
 
         view = CategorySelectionView()
-        if hasattr(view, 'category_select'):
+        if view.has_options:
             await interaction.response.send_message(
                 "🗑️ **Delete Channels in Category**\n"
                 "⚠️ **WARNING:** This will delete ALL channels in the selected category!\n"
@@ -347,27 +326,14 @@ class AdminCog(commands.Cog):
         if not is_mod(interaction):
             await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
             return
-        class CategorySelectionView(discord.ui.View):
+        class CategorySelectionView(ChannelPickerView):
             def __init__(self):
-                super().__init__(timeout=300)
+                super().__init__(interaction.guild, "category", "Select a category...", timeout=300)
                 self.selected_category = None
-                categories = interaction.guild.categories
-                if not categories:
-                    return
-                category_options = []
-                for category in categories:
-                    category_options.append(discord.SelectOption(label=category.name, value=str(category.id)))
-                if category_options:
-                    self.category_select = discord.ui.Select(
-                        placeholder="Select a category...",
-                        options=category_options,
-                        min_values=1,
-                        max_values=1
-                    )
-                    self.category_select.callback = self.category_callback
-                    self.add_item(self.category_select)
-            async def category_callback(self, interaction2: discord.Interaction):
-                self.selected_category = interaction2.data['values'][0]
+            async def on_pick(self, interaction2: discord.Interaction, values):
+                await self.category_callback(interaction2, values[0])
+            async def category_callback(self, interaction2: discord.Interaction, value):
+                self.selected_category = value
                 category = interaction.guild.get_channel(int(self.selected_category))
                 if category:
                     # ...existing code to sort channels...
@@ -375,7 +341,7 @@ class AdminCog(commands.Cog):
                 else:
                     await interaction2.response.send_message("❌ Category not found.", ephemeral=True)
         view = CategorySelectionView()
-        if hasattr(view, 'category_select'):
+        if view.has_options:
             await interaction.response.send_message(
                 "📂 **Sort Channels in Category**\nSelect a category to sort all text and voice channels within it alphabetically:",
                 ephemeral=True,
@@ -396,41 +362,14 @@ class MoveCog(commands.Cog):
         view = self.MoveSetupView(interaction.guild)
         await interaction.response.send_message("Select VCs/categories and a role for move permissions:", ephemeral=True, view=view)
 
-    class MoveSetupView(discord.ui.View):
+    class MoveSetupView(ChannelPickerView):
         def __init__(self, guild):
-            super().__init__(timeout=120)
-            self.guild = guild
-            # Voice channels
-            voice_channels = [ch for ch in guild.voice_channels]
-            vc_options = [
-                discord.SelectOption(label=vc.name, value=f"vc:{vc.id}")
-                for vc in voice_channels
-            ]
-            # Categories with VCs
-            categories = [cat for cat in guild.categories if any(isinstance(ch, discord.VoiceChannel) for ch in cat.channels)]
-            cat_options = [
-                discord.SelectOption(label=cat.name, value=f"cat:{cat.id}")
-                for cat in categories
-            ]
-            options = vc_options + cat_options
-            self.channel_select = discord.ui.Select(
-                placeholder="Select voice channels or categories...",
-                min_values=1,
-                max_values=min(25, len(options)),
-                options=options[:25]
-            )
-            self.channel_select.callback = self.channel_callback
-            self.add_item(self.channel_select)
-            # Role select
-            role_options = [
-                discord.SelectOption(label=role.name, value=str(role.id))
-                for role in guild.roles if not role.is_default()
-            ]
-            self.role_select = discord.ui.Select(
+            super().__init__(guild, "voice", "Select voice channels or categories...", max_values=25)
+            self.role_select = discord.ui.RoleSelect(
                 placeholder="Select a role to grant move power...",
                 min_values=1,
                 max_values=1,
-                options=role_options[:25]
+                row=2
             )
             self.role_select.callback = self.role_callback
             self.add_item(self.role_select)
@@ -438,10 +377,10 @@ class MoveCog(commands.Cog):
             self.selected_categories = set()
             self.selected_role = None
 
-        async def channel_callback(self, interaction: discord.Interaction):
+        async def on_pick(self, interaction: discord.Interaction, values):
             self.selected_channels = set()
             self.selected_categories = set()
-            for v in self.channel_select.values:
+            for v in values:
                 if v.startswith("vc:"):
                     self.selected_channels.add(int(v[3:]))
                 elif v.startswith("cat:"):
@@ -449,26 +388,25 @@ class MoveCog(commands.Cog):
             await interaction.response.send_message(f"Selected channels/categories updated.", ephemeral=True, delete_after=1)
 
         async def role_callback(self, interaction: discord.Interaction):
-            self.selected_role = int(self.role_select.values[0])
+            self.selected_role = self.role_select.values[0].id
             await interaction.response.send_message(f"Selected role updated.", ephemeral=True, delete_after=1)
 
-        @discord.ui.button(label="Save Setup", style=discord.ButtonStyle.success)
+        @discord.ui.button(label="Save Setup", style=discord.ButtonStyle.success, row=3)
         async def save(self, interaction: discord.Interaction, button: discord.ui.Button):
             if not self.selected_role or (not self.selected_channels and not self.selected_categories):
                 await interaction.response.send_message("Please select at least one channel/category and a role.", ephemeral=True)
                 return
-            move_config['role_id'] = self.selected_role
-            move_config['channel_ids'] = self.selected_channels
-            move_config['category_ids'] = self.selected_categories
+            vc_access_config.save(self.guild.id, "move", self.selected_role, self.selected_channels, self.selected_categories)
             await interaction.response.send_message("✅ Move setup saved!", ephemeral=True)
 
 # Move Member context menu command (must be at module level)
 @app_commands.context_menu(name="Move Member")
 async def move_member_context(interaction: discord.Interaction, target: discord.Member):
-    if not move_config['role_id']:
+    config = vc_access_config.get(interaction.guild_id, "move")
+    if not config:
         await interaction.response.send_message("Move setup not configured.", ephemeral=True)
         return
-    if move_config['role_id'] not in [role.id for role in interaction.user.roles]:
+    if interaction.user.get_role(config['role_id']) is None:
         await interaction.response.send_message("You do not have the move role.", ephemeral=True)
         return
     if not interaction.user.voice or not target.voice:
@@ -476,39 +414,28 @@ async def move_member_context(interaction: discord.Interaction, target: discord.
         return
     user_vc = interaction.user.voice.channel
     target_vc = target.voice.channel
-    allowed = False
-    if user_vc.id in move_config['channel_ids']:
-        allowed = user_vc.id == target_vc.id
-    for cat_id in move_config['category_ids']:
-        cat = interaction.guild.get_channel(cat_id)
-        if cat and user_vc in cat.channels and user_vc == target_vc:
-            allowed = True
+    allowed = user_vc.id == target_vc.id and allowed_vcs.is_allowed(interaction.guild, "move", user_vc.id)
     if not allowed:
         await interaction.response.send_message("You can only move members in the same allowed VC.", ephemeral=True)
         return
-    dest_vcs = [vc for vc in interaction.guild.voice_channels if vc != user_vc]
-    if not dest_vcs:
-        await interaction.response.send_message("No other voice channels to move to.", ephemeral=True)
-        return
-    class DestVCSelect(discord.ui.View):
-        def __init__(self, vcs):
-            super().__init__(timeout=30)
-            options = [discord.SelectOption(label=vc.name, value=str(vc.id)) for vc in vcs]
-            self.select = discord.ui.Select(placeholder="Select destination VC...", options=options)
-            self.select.callback = self.select_callback
-            self.add_item(self.select)
-            self.selected = None
-        async def select_callback(self, i2):
-            self.selected = int(self.select.values[0])
+    class DestVCSelect(ChannelPickerView):
+        def __init__(self):
+            super().__init__(interaction.guild, "vc", "Select destination VC...", exclude={str(user_vc.id)}, timeout=60)
+            self.destination = None
+        async def on_pick(self, i2, values):
+            self.destination = int(values[0])
             await i2.response.defer()
             self.stop()
-    view = DestVCSelect(dest_vcs)
+    view = DestVCSelect()
+    if not view.has_options:
+        await interaction.response.send_message("No other voice channels to move to.", ephemeral=True)
+        return
     await interaction.response.send_message("Select a destination VC to move the member:", ephemeral=True, view=view)
     timeout = await view.wait()
-    if view.selected:
+    if view.destination:
         try:
-            await target.move_to(interaction.guild.get_channel(view.selected))
-            await interaction.followup.send(f"✅ Moved {target.display_name} to <#{view.selected}>.", ephemeral=True)
+            await target.move_to(interaction.guild.get_channel(view.destination))
+            await interaction.followup.send(f"✅ Moved {target.display_name} to <#{view.destination}>.", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"❌ Failed to move: {e}", ephemeral=True)
     else:
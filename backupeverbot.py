@@ -21,6 +21,7 @@ import time
 import logging
 import warnings
 from discord.utils import get as discord_get
+from bot.cogs.channel_picker import ChannelPickerView
 
 
 # Suppress PyNaCl warning since we don't use voice features
@@ -355,39 +356,16 @@ async def broadcastembed(interaction: discord.Interaction):
         await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
         return
 
-    class CategorySelectionView(discord.ui.View):
+    class CategorySelectionView(ChannelPickerView):
         def __init__(self, interaction):
-            super().__init__(timeout=300)
+            super().__init__(interaction.guild, "category", "Select a category to broadcast to...", timeout=300)
             self.selected_category = None
             self.interaction = interaction
-            categories = interaction.guild.categories
-            if not categories:
-                self.category_select = None
-                return
-            category_options = [
-                discord.SelectOption(
-                    label=category.name,
-                    value=str(category.id),
-                    description=f"{len(category.channels)} channels"
-                ) for category in categories
-            ]
-            if category_options:
-                self.category_select = discord.ui.Select(
-                    placeholder="Select a category to broadcast to...",
-                    options=category_options[:25],
-                    min_values=1,
-                    max_values=1
-                )
-                self.category_select.callback = self.category_callback
-                self.add_item(self.category_select)
-            else:
-                self.category_select = None
 
-        async def category_callback(self, interaction2: discord.Interaction):
-            self.selected_category = interaction2.data['values'][0]
+        async def on_pick(self, interaction2: discord.Interaction, values):
+            self.selected_category = values[0]
             category = self.interaction.guild.get_channel(int(self.selected_category))
             if category:
-                text_channels = [ch for ch in category.channels if isinstance(ch, discord.TextChannel)]
                 modal = BroadcastEmbedModal(self.selected_category, self.interaction)
                 await interaction2.response.send_modal(modal)
             else:
@@ -530,7 +508,7 @@ async def broadcastembed(interaction: discord.Interaction):
             await interaction3.response.send_message("❌ Broadcast cancelled.", ephemeral=True)
 
     view = CategorySelectionView(interaction)
-    if getattr(view, 'category_select', None):
+    if view.has_options:
         await interaction.response.send_message(
             "📡 **Broadcast Embed to Category**\n"
             "Select a category to broadcast your embed message to all text channels within it:",
@@ -577,7 +555,12 @@ async def setup_hook():
         "bot.cogs.fun",
         "bot.cogs.scoreboard",
         "bot.cogs.utility",
+        "bot.cogs.scheduler",
+        "bot.cogs.prefix_router",
+        "bot.cogs.vc_access",
+        "bot.cogs.voice_presence",
         "bot.cogs.voice",
+        "bot.cogs.voice_attendance",
         "bot.cogs.vc_lock_cog",
         "bot.cogs.generate1on1s",
     ]
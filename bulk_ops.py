@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Edits to different channels use separate rate-limit buckets, so a handful can run at
+# once; discord.py still queues anything that lands on the same bucket.
+BULK_CONCURRENCY = 5
+# 429s that escape discord.py's own handling are retried this many times
+MAX_RETRIES = 3
+# Seconds between edits of a streamed progress message
+PROGRESS_INTERVAL = 2
+
+
+class BulkResult:
+    """Outcome of a run_bulk call: items done, skipped, and (item, error) failures."""
+    def __init__(self):
+        self.done = []
+        self.skipped = []
+        self.failed = []
+
+    @property
+    def total(self):
+        return len(self.done) + len(self.skipped) + len(self.failed)
+
+    def summary(self, verb, noun="voice channels"):
+        text = f"✅ {verb} {len(self.done)} {noun}."
+        if self.skipped:
+            text += f" {len(self.skipped)} already up to date."
+        if self.failed:
+            shown = ", ".join(f"{getattr(item, 'name', item)} ({error})" for item, error in self.failed[:5])
+            more = f" and {len(self.failed) - 5} more" if len(self.failed) > 5 else ""
+            text += f"\n❌ {len(self.failed)} failed: {shown}{more}"
+        return text
+
+
+def _retry_after(error, attempt):
+    """Seconds to wait after a 429, from the error or the response's rate-limit headers."""
+    retry_after = getattr(error, "retry_after", None)
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header in ("Retry-After", "X-RateLimit-Reset-After"):
+        if retry_after:
+            break
+        try:
+            retry_after = float(headers.get(header) or 0)
+        except ValueError:
+            pass
+    return retry_after or 2 ** attempt
+
+
+async def _with_retry(action, item):
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return await action(item)
+        except discord.HTTPException as e:
+            if e.status != 429 or attempt == MAX_RETRIES:
+                raise
+            retry_after = _retry_after(e, attempt)
+            logger.info(f"Rate limited on {getattr(item, 'name', item)}; retrying in {retry_after:.1f}s")
+            await asyncio.sleep(retry_after)
+
+
+async def run_bulk(items, action, skip=None, concurrency=BULK_CONCURRENCY, on_progress=None):
+    """Run `await action(item)` for every item, at most `concurrency` at a time.
+
+    Items for which `skip(item)` is true are not touched. `on_progress(result)`, if
+    given, is awaited after each item finishes. Errors are collected, not raised.
+    """
+    result = BulkResult()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(item):
+        if skip is not None and skip(item):
+            result.skipped.append(item)
+        else:
+            async with semaphore:
+                try:
+                    await _with_retry(action, item)
+                    result.done.append(item)
+                except Exception as e:
+                    logger.error(f"Bulk operation failed for {getattr(item, 'name', item)}: {e}")
+                    result.failed.append((item, e))
+        if on_progress is not None:
+            await on_progress(result)
+
+    await asyncio.gather(*(run_one(item) for item in items))
+    return result
+
+
+class ProgressMessage:
+    """on_progress callback for run_bulk that streams progress into one message.
+
+    The message is edited at most once every `interval` seconds, and always for the
+    last item, so progress costs a bounded number of edits however many items there are.
+    """
+    def __init__(self, message, title, total, interval=PROGRESS_INTERVAL):
+        self.message = message
+        self.title = title
+        self.total = total
+        self.interval = interval
+        self._last_edit = 0.0
+
+    async def __call__(self, result):
+        now = asyncio.get_running_loop().time()
+        if result.total < self.total and now - self._last_edit < self.interval:
+            return
+        self._last_edit = now
+        percent = int(result.total / self.total * 100) if self.total else 100
+        content = f"{self.title}\nProgress: {result.total}/{self.total} ({percent}%)"
+        if result.failed:
+            content += f" · {len(result.failed)} failed"
+        try:
+            await self.message.edit(content=content)
+        except discord.HTTPException:
+            pass
+
+
+async def set_user_limits(voice_channels, limit):
+    """Set `user_limit` on every channel, skipping those already at `limit`."""
+    return await run_bulk(
+        voice_channels,
+        lambda vc: vc.edit(user_limit=limit),
+        skip=lambda vc: vc.user_limit == limit
+    )
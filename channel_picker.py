@@ -0,0 +1,245 @@
+import abc
+import bisect
+import re
+from collections import namedtuple
+import discord
+from discord import app_commands
+
+# Discord caps a select menu (and an autocomplete response) at 25 options
+PAGE_SIZE = 25
+
+PickerEntry = namedtuple("PickerEntry", "label value description")
+
+_WORD_SPLIT = re.compile(r"[\s\-_|:.·]+")
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ChannelNameIndex:
+    """Prefix and trigram index over one guild's channel/category names.
+
+    Prefix hits (on the whole name or any word in it) come from a bisect over a sorted
+    word list; longer queries also match anywhere in the name via trigram postings.
+    """
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda e: (e.label.lower(), e.value))
+        self._names = [e.label.lower() for e in self.entries]
+        self._trigrams = {}  # trigram: [entry index]
+        words = []
+        for idx, name in enumerate(self._names):
+            for word in {name, *_WORD_SPLIT.split(name)}:
+                if word:
+                    words.append((word, idx))
+            for tri in _trigrams(name):
+                self._trigrams.setdefault(tri, []).append(idx)
+        words.sort()
+        self._words = [w for w, _ in words]
+        self._word_ids = [i for _, i in words]
+
+    def search(self, query):
+        """Entries matching `query`, prefix matches first, each group in name order."""
+        q = query.strip().lower()
+        if not q:
+            return list(self.entries)
+        lo = bisect.bisect_left(self._words, q)
+        hi = bisect.bisect_left(self._words, q + "\U0010ffff", lo)
+        prefix = set(self._word_ids[lo:hi])
+        substring = set()
+        if len(q) >= 3:
+            postings = sorted((self._trigrams.get(t, ()) for t in _trigrams(q)), key=len)
+            if postings[0]:
+                candidates = set(postings[0]).intersection(*postings[1:])
+                substring = {i for i in candidates if i not in prefix and q in self._names[i]}
+        return [self.entries[i] for i in sorted(prefix)] + [self.entries[i] for i in sorted(substring)]
+
+
+def _voice_entries(guild):
+    entries = [PickerEntry(vc.name, f"vc:{vc.id}", "Voice Channel") for vc in guild.voice_channels]
+    for cat in guild.categories:
+        vc_count = sum(isinstance(ch, discord.VoiceChannel) for ch in cat.channels)
+        entries.append(PickerEntry(cat.name, f"cat:{cat.id}", f"{vc_count} VCs"))
+    return entries
+
+
+def _category_entries(guild):
+    return [PickerEntry(cat.name, str(cat.id), f"{len(cat.channels)} channels") for cat in guild.categories]
+
+
+def _vc_entries(guild):
+    return [PickerEntry(vc.name, str(vc.id), None) for vc in guild.voice_channels]
+
+
+# kind: builder. "voice" mixes VCs and categories ("vc:<id>" / "cat:<id>" values),
+# "category" and "vc" hold bare IDs.
+_ENTRY_BUILDERS = {
+    "voice": _voice_entries,
+    "category": _category_entries,
+    "vc": _vc_entries,
+}
+
+
+class PickerIndexCache:
+    """Per-guild ChannelNameIndex objects, dropped whenever the channel layout changes."""
+    def __init__(self):
+        self._indexes = {}  # (kind, guild_id): ChannelNameIndex
+
+    def get(self, guild, kind):
+        key = (kind, guild.id)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = ChannelNameIndex(_ENTRY_BUILDERS[kind](guild))
+        return index
+
+    def invalidate(self, guild_id):
+        for key in [k for k in self._indexes if k[1] == guild_id]:
+            del self._indexes[key]
+
+
+picker_indexes = PickerIndexCache()
+
+
+def parse_channel_target(value):
+    """("vc" | "cat", id) for a "vc:<id>" / "cat:<id>" value, or None if it is not one.
+
+    Slash command options only suggest these values; users can still type anything.
+    """
+    kind, _, raw_id = value.partition(":")
+    if kind not in ("vc", "cat"):
+        return None
+    try:
+        return kind, int(raw_id)
+    except ValueError:
+        return None
+
+
+def channel_autocomplete(kind):
+    """Slash-command autocomplete callback searching the guild's picker index."""
+    async def autocomplete(interaction: discord.Interaction, current: str):
+        if interaction.guild is None:
+            return []
+        index = picker_indexes.get(interaction.guild, kind)
+        return [app_commands.Choice(name=e.label[:100], value=e.value) for e in index.search(current)[:PAGE_SIZE]]
+    return autocomplete
+
+
+class ChannelPickerView(discord.ui.View, metaclass=abc.ABCMeta):
+    """Paged, searchable channel/category select that is not limited to 25 options.
+
+    Subclasses implement `on_pick(interaction, values)`. With max_values > 1, picks are
+    remembered across pages and search results, and `values` is the full selection.
+    Extra items added by subclasses should use rows 2-4.
+    """
+    def __init__(self, guild, kind, placeholder, max_values=1, exclude=(), timeout=120):
+        super().__init__(timeout=timeout)
+        self.guild = guild
+        self.index = picker_indexes.get(guild, kind)
+        self.placeholder = placeholder
+        self.max_values = max_values
+        self.exclude = set(exclude)
+        self.query = ""
+        self.page = 0
+        self.results = []
+        self.selected = []
+
+        self.picker_select = discord.ui.Select(placeholder=placeholder, row=0)
+        self.picker_select.callback = self._picker_select_callback
+        self.add_item(self.picker_select)
+        self.prev_button = discord.ui.Button(label="◀ Previous", style=discord.ButtonStyle.secondary, row=1)
+        self.prev_button.callback = self._prev_page
+        self.add_item(self.prev_button)
+        self.next_button = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.secondary, row=1)
+        self.next_button.callback = self._next_page
+        self.add_item(self.next_button)
+        self.search_button = discord.ui.Button(label="🔍 Search", style=discord.ButtonStyle.primary, row=1)
+        self.search_button.callback = self._open_search
+        self.add_item(self.search_button)
+        self.clear_button = discord.ui.Button(label="Clear Search", style=discord.ButtonStyle.secondary, row=1)
+        self.clear_button.callback = self._clear_search
+        self.add_item(self.clear_button)
+        self.refresh()
+
+    @property
+    def has_options(self):
+        return any(e.value not in self.exclude for e in self.index.entries)
+
+    @property
+    def page_count(self):
+        return max(1, (len(self.results) + PAGE_SIZE - 1) // PAGE_SIZE)
+
+    def refresh(self):
+        self.results = [e for e in self.index.search(self.query) if e.value not in self.exclude]
+        self.page = min(self.page, self.page_count - 1)
+        page_entries = self.results[self.page * PAGE_SIZE:(self.page + 1) * PAGE_SIZE]
+        self.picker_select.options = [
+            discord.SelectOption(label=e.label[:100], value=e.value, description=e.description, default=e.value in self.selected)
+            for e in page_entries
+        ]
+        if page_entries:
+            self.picker_select.disabled = False
+            # Multi-select keeps picks from other pages, so clearing this page must be possible
+            self.picker_select.min_values = 0 if self.max_values > 1 else 1
+            self.picker_select.max_values = min(self.max_values, len(page_entries))
+        else:
+            # A select needs at least one option even when nothing matches
+            self.picker_select.options = [discord.SelectOption(label="No matches", value="none")]
+            self.picker_select.disabled = True
+        placeholder = f"{self.placeholder} (Page {self.page + 1}/{self.page_count})"
+        if self.query:
+            placeholder = f"{placeholder} matching \"{self.query}\""
+        self.picker_select.placeholder = placeholder[:150]
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= self.page_count - 1
+        self.clear_button.disabled = not self.query
+
+    @abc.abstractmethod
+    async def on_pick(self, interaction: discord.Interaction, values):
+        """Called with the picked values; the interaction has not been responded to yet."""
+
+    async def _picker_select_callback(self, interaction: discord.Interaction):
+        values = list(self.picker_select.values)
+        if self.max_values > 1:
+            page_values = {o.value for o in self.picker_select.options}
+            self.selected = [v for v in self.selected if v not in page_values] + values
+            values = list(self.selected)
+        await self.on_pick(interaction, values)
+
+    async def _prev_page(self, interaction: discord.Interaction):
+        self.page = max(0, self.page - 1)
+        self.refresh()
+        await interaction.response.edit_message(view=self)
+
+    async def _next_page(self, interaction: discord.Interaction):
+        self.page = min(self.page_count - 1, self.page + 1)
+        self.refresh()
+        await interaction.response.edit_message(view=self)
+
+    async def _open_search(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(ChannelSearchModal(self))
+
+    async def _clear_search(self, interaction: discord.Interaction):
+        self.query = ""
+        self.page = 0
+        self.refresh()
+        await interaction.response.edit_message(view=self)
+
+
+class ChannelSearchModal(discord.ui.Modal, title="Search Channels"):
+    def __init__(self, picker):
+        super().__init__()
+        self.picker = picker
+        self.query_input = discord.ui.TextInput(
+            label="Name starts with or contains",
+            style=discord.TextStyle.short,
+            required=False,
+            default=picker.query or None,
+            max_length=100
+        )
+        self.add_item(self.query_input)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        self.picker.query = self.query_input.value.strip()
+        self.picker.page = 0
+        self.picker.refresh()
+        await interaction.response.edit_message(view=self.picker)
@@ -1,15 +1,485 @@
 # ...existing imports...
+import os
 import re
+import gzip
+import json
+import time
+import asyncio
+import logging
+import tarfile
+import itertools
 import discord
 from discord import app_commands
 from discord.ext import commands
-import asyncio
+from bot.cogs.bulk_ops import run_bulk, ProgressMessage
 # Import mod_role_id from your main bot file
 try:
     from backupeverbot import mod_role_id
 except ImportError:
     mod_role_id = None
 
+logger = logging.getLogger(__name__)
+
+# Runs in progress, per guild, so an interrupted run can be resumed from /generate1on1s
+CHECKPOINT_FILE = "generate1on1s_checkpoint.json"
+# Channel creates in flight at once. discord.py tracks the create bucket's remaining
+# allowance and holds back anything beyond it, so this only has to be large enough to
+# keep the bucket busy; 429s that still get through are retried by run_bulk.
+CREATE_CONCURRENCY = 10
+# Discord's limits on channels in one category and in one server
+MAX_CATEGORY_CHANNELS = 50
+MAX_GUILD_CHANNELS = 500
+# Rough planning figure for channel creates per second with the bucket kept saturated
+PLANNED_CREATES_PER_SECOND = 2
+# Every generated channel's topic starts with this; /teardown1on1s finds them by it
+PAIR_TOPIC_PREFIX = "Private 1-on-1 channel between "
+# /teardown1on1s writes one gzipped transcript per channel under here
+TRANSCRIPT_DIR = "transcripts"
+# Transcript lines are compressed and written off the event loop this many at a time (one history page)
+TRANSCRIPT_WRITE_BATCH = 100
+# Transcript archives up to this size are also uploaded with the teardown summary
+TRANSCRIPT_UPLOAD_LIMIT = 8 * 1024 * 1024
+
+
+def role_slug(role):
+    return re.sub(r'[^a-zA-Z0-9]', '', role.name.lower())
+
+def pair_channel_name(role_a, role_b):
+    return f"{role_slug(role_a)}-{role_slug(role_b)}"[:100]
+
+def round_robin_pairs(roles):
+    """Every unordered pair of `roles`, N·(N−1)/2 of them, each pair in alphabetical order."""
+    return list(itertools.combinations(sorted(roles, key=lambda r: r.name.lower()), 2))
+
+def overflow_name(base_name, number):
+    return f"{base_name} {number}"
+
+def pair_overwrites(guild, roles, add_mod_role=False):
+    """Overwrites for a private channel that only `roles` (plus the bot, and optionally mods) can see."""
+    overwrites = {guild.default_role: discord.PermissionOverwrite(view_channel=False)}
+    for role in roles:
+        overwrites[role] = discord.PermissionOverwrite(
+            view_channel=True,
+            send_messages=True,
+            read_messages=True,
+            read_message_history=True,
+            attach_files=True,
+            embed_links=True
+        )
+    overwrites[guild.me] = discord.PermissionOverwrite(
+        view_channel=True,
+        send_messages=True,
+        read_messages=True,
+        manage_messages=True
+    )
+    # Add mod role if option is enabled and mod_role_id is set and exists in guild
+    if add_mod_role and mod_role_id:
+        mod_role = guild.get_role(mod_role_id)
+        if mod_role:
+            overwrites[mod_role] = discord.PermissionOverwrite(
+                view_channel=True,
+                send_messages=True,
+                read_messages=True,
+                read_message_history=True,
+                manage_messages=True
+            )
+    return overwrites
+
+
+class OverflowCategory:
+    """A category to add after `base` once it is full, standing in for it until it exists.
+
+    It is created on first use, copying the base category's overwrites; concurrent
+    channel creates that land in it wait on the same request.
+    """
+    def __init__(self, base, number):
+        self.base = base
+        self.number = number
+        self.name = overflow_name(base.name, number)
+        self.category = None
+        self._lock = asyncio.Lock()
+
+    async def resolve(self):
+        if self.category is None:
+            async with self._lock:
+                if self.category is None:
+                    self.category = await self.base.guild.create_category(
+                        self.name,
+                        overwrites=self.base.overwrites,
+                        position=self.base.position + self.number - 1,
+                        reason=f"1-on-1 channels overflow from {self.base.name}"
+                    )
+        return self.category
+
+
+class PairChannel:
+    """One 1-on-1 channel to create: where it goes, what it is called and who can see it."""
+    __slots__ = ("category", "role_a", "role_b", "name", "overwrites", "position", "existing")
+
+    def __init__(self, category, role_a, role_b, overwrites, position=None):
+        self.category = category
+        self.role_a = role_a
+        self.role_b = role_b
+        self.name = pair_channel_name(role_a, role_b)
+        self.overwrites = overwrites
+        self.position = position
+        self.existing = None  # the channel, if one with this name is already in the category
+
+    def __str__(self):
+        return f"{self.name} in {self.category.name}"
+
+    async def create(self):
+        kwargs = {"position": self.position} if self.position is not None else {}
+        if isinstance(self.category, OverflowCategory):
+            self.category = await self.category.resolve()
+        return await self.category.create_text_channel(
+            name=self.name,
+            overwrites=self.overwrites,
+            reason=f"1-on-1 competition channel: {self.role_a.name} vs {self.role_b.name}",
+            topic=f"{PAIR_TOPIC_PREFIX}{self.role_a.name} and {self.role_b.name}",
+            **kwargs
+        )
+
+
+    async def apply(self):
+        """Create the channel, or put its overwrites right if it already exists."""
+        if self.existing is None:
+            return await self.create()
+        await self.existing.edit(overwrites=self.overwrites, reason="1-on-1 channel permissions repaired")
+        return self.existing
+
+
+def load_checkpoints():
+    if not os.path.exists(CHECKPOINT_FILE):
+        return {}
+    try:
+        with open(CHECKPOINT_FILE, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load {CHECKPOINT_FILE}: {e}")
+        return {}
+
+def save_checkpoints(checkpoints):
+    tmp_path = f"{CHECKPOINT_FILE}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoints, f)
+        os.replace(tmp_path, CHECKPOINT_FILE)
+    except Exception as e:
+        logger.error(f"Failed to save {CHECKPOINT_FILE}: {e}")
+
+
+def describe_name_collisions(collisions, limit=5):
+    """One line per skipped pair, naming the pair that got the channel name first."""
+    lines = [
+        f"• {pair.role_a.name} vs {pair.role_b.name} → #{pair.name} (same as {taken.role_a.name} vs {taken.role_b.name})"
+        for pair, taken in collisions[:limit]
+    ]
+    if len(collisions) > limit:
+        lines.append(f"... and {len(collisions) - limit} more")
+    return lines
+
+
+class GenerationPlan:
+    """What a GenerationJob will do, worked out before any request is made."""
+    def __init__(self):
+        self.to_create = []
+        self.to_repair = []
+        self.up_to_date = []
+        self.categories = []  # existing categories involved, overflow ones included
+        self.new_categories = []  # OverflowCategory placeholders to be created
+        self.name_collisions = []  # (pair, planned pair) whose role names slug to the same channel name
+        self.over_guild_limit = False
+
+    @property
+    def requests(self):
+        return len(self.to_create) + len(self.to_repair) + len(self.new_categories)
+
+    def preview(self):
+        seconds = self.requests / PLANNED_CREATES_PER_SECOND
+        lines = [
+            f"**Channels to create:** {len(self.to_create)}",
+            f"**Permissions to repair:** {len(self.to_repair)}",
+            f"**Already in place:** {len(self.up_to_date)}",
+            f"**Categories:** {len(self.categories) + len(self.new_categories)}"
+            + (f" ({len(self.new_categories)} new: {', '.join(c.name for c in self.new_categories)})" if self.new_categories else ""),
+            f"**Estimated time:** ~{int(seconds // 60)}m {int(seconds % 60)}s for {self.requests} API requests",
+        ]
+        if self.name_collisions:
+            lines.append(f"⚠️ **Skipped, channel name already taken by another pair:** {len(self.name_collisions)}")
+            lines.extend(describe_name_collisions(self.name_collisions))
+        if self.over_guild_limit:
+            lines.append(f"❌ This would go past Discord's {MAX_GUILD_CHANNELS} channel limit per server.")
+        return "\n".join(lines)
+
+
+class GenerationJob:
+    """One generation run: a channel for each role pair in each selected category.
+
+    Existing channels are found through a name index built once per category, so
+    re-running a job only creates what is missing and repairs overwrites that drifted.
+    The job is checkpointed when it starts and cleared once every channel is in place,
+    which lets /generate1on1s resume a run that was interrupted.
+    """
+    def __init__(self, guild, role_pairs, categories, add_mod_role=False):
+        self.guild = guild
+        self.role_pairs = role_pairs
+        self.categories = categories
+        self.add_mod_role = add_mod_role
+
+    def to_checkpoint(self):
+        return {
+            "pairs": [[a.id, b.id] for a, b in self.role_pairs],
+            "categories": [c.id for c in self.categories],
+            "add_mod_role": self.add_mod_role,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, guild, data):
+        """The checkpointed job, or None if its roles or categories no longer exist."""
+        pairs = [(guild.get_role(a), guild.get_role(b)) for a, b in data["pairs"]]
+        categories = [guild.get_channel(cid) for cid in data["categories"]]
+        if not pairs or any(a is None or b is None for a, b in pairs) or any(c is None for c in categories):
+            return None
+        return cls(guild, pairs, categories, data.get("add_mod_role", False))
+
+    def category_chain(self, category):
+        """`category` followed by the overflow categories already made for it."""
+        by_name = {c.name: c for c in self.guild.categories}
+        chain = [category]
+        while overflow_name(category.name, len(chain) + 1) in by_name:
+            chain.append(by_name[overflow_name(category.name, len(chain) + 1)])
+        return chain
+
+    def plan(self):
+        """Work out what the job has to do, from the channel cache alone."""
+        plan = GenerationPlan()
+        for category in self.categories:
+            chain = self.category_chain(category)
+            index = {channel.name: channel for c in chain for channel in c.text_channels}
+            free = [MAX_CATEGORY_CHANNELS - len(c.channels) for c in chain]
+            # Channels are created concurrently, so give each its place up front to keep them sorted
+            next_position = [max((ch.position for ch in c.channels), default=-1) + 1 for c in chain]
+            slot = 0
+            for role_a, role_b in self.role_pairs:
+                overwrites = pair_overwrites(self.guild, [role_a, role_b], self.add_mod_role)
+                pair = PairChannel(category, role_a, role_b, overwrites)
+                pair.existing = index.get(pair.name)
+                if isinstance(pair.existing, PairChannel):
+                    # Another pair in this job already maps to the same channel name
+                    plan.name_collisions.append((pair, pair.existing))
+                    continue
+                if pair.existing is not None:
+                    pair.category = pair.existing.category
+                    if pair.existing.overwrites != overwrites:
+                        plan.to_repair.append(pair)
+                    else:
+                        plan.up_to_date.append(pair)
+                    continue
+                # Full categories spill into the next one in the chain, adding overflow categories as needed
+                while slot < len(chain) and free[slot] <= 0:
+                    slot += 1
+                if slot == len(chain):
+                    overflow = OverflowCategory(category, len(chain) + 1)
+                    plan.new_categories.append(overflow)
+                    chain.append(overflow)
+                    free.append(MAX_CATEGORY_CHANNELS)
+                    next_position.append(0)
+                pair.category = chain[slot]
+                pair.position = next_position[slot]
+                free[slot] -= 1
+                next_position[slot] += 1
+                plan.to_create.append(pair)
+                index[pair.name] = pair
+            plan.categories.extend(c for c in chain if not isinstance(c, OverflowCategory))
+        plan.over_guild_limit = len(self.guild.channels) + len(plan.to_create) + len(plan.new_categories) > MAX_GUILD_CHANNELS
+        return plan
+
+    async def run(self, interaction):
+        """Run the job, reporting progress and the result as followups to a deferred interaction."""
+        plan = self.plan()
+        work = plan.to_create + plan.to_repair
+        if not work:
+            self._clear_checkpoint()
+            text = f"✅ All {len(plan.up_to_date)} channels already exist with the right permissions."
+            if plan.name_collisions:
+                text += f"\n\n⚠️ **Skipped {len(plan.name_collisions)} pairs whose channel name is taken by another pair:**\n"
+                text += "\n".join(describe_name_collisions(plan.name_collisions))
+            await interaction.followup.send(text, ephemeral=True)
+            return
+        if plan.over_guild_limit:
+            await interaction.followup.send(f"❌ This would take the server past Discord's {MAX_GUILD_CHANNELS} channel limit.", ephemeral=True)
+            return
+        checkpoints = load_checkpoints()
+        checkpoints[str(self.guild.id)] = self.to_checkpoint()
+        save_checkpoints(checkpoints)
+
+        title = f"🚀 **Creating {len(plan.to_create)} channels" + (f", repairing {len(plan.to_repair)}" if plan.to_repair else "") + "...**"
+        progress_msg = await interaction.followup.send(f"{title}\nProgress: 0/{len(work)} (0%)", ephemeral=True)
+        result = await run_bulk(
+            work, lambda pair: pair.apply(), concurrency=CREATE_CONCURRENCY,
+            on_progress=ProgressMessage(progress_msg, title, len(work))
+        )
+        if not result.failed:
+            self._clear_checkpoint()
+        await interaction.followup.send(self.summary(result, plan), ephemeral=True)
+
+    def _clear_checkpoint(self):
+        checkpoints = load_checkpoints()
+        if checkpoints.pop(str(self.guild.id), None) is not None:
+            save_checkpoints(checkpoints)
+
+    def summary(self, result, plan):
+        created = [pair for pair in result.done if pair.existing is None]
+        up_to_date = len(plan.up_to_date)
+        repaired = len(result.done) - len(created)
+        text = "✅ **1-on-1 Competition Channels Created!**\n\n"
+        text += f"**Created:** {len(created)} channels\n"
+        if repaired:
+            text += f"**Repaired permissions:** {repaired} channels\n"
+        if up_to_date:
+            text += f"**Already in place:** {up_to_date} channels\n"
+        per_category = {}
+        for pair in created:
+            per_category[pair.category.name] = per_category.get(pair.category.name, 0) + 1
+        per_category = [f"📂 **{name}**: {count} channels" for name, count in per_category.items()]
+        if per_category:
+            text += "\n**Created in:**\n" + "\n".join(per_category) + "\n"
+        if result.failed:
+            failed = [
+                f"{pair}: {'Missing permissions' if isinstance(e, discord.Forbidden) else str(e)[:50]}"
+                for pair, e in result.failed
+            ]
+            text += f"\n**Failed:** {len(failed)} channels\n**Failed channels:**\n" + "\n".join(failed[:5])
+            if len(failed) > 5:
+                text += f"\n... and {len(failed) - 5} more"
+            text += "\n🔁 Run `/generate1on1s` again to resume; existing channels are skipped."
+        if plan.name_collisions:
+            text += f"\n⚠️ **Skipped {len(plan.name_collisions)} pairs whose channel name is taken by another pair:**\n"
+            text += "\n".join(describe_name_collisions(plan.name_collisions)) + "\n"
+        text += "\n💡 **Tip:** Use `/sortcategory` if you need to reorder channels alphabetically."
+        return text
+
+
+def find_pair_channels(guild, category=None):
+    """Text channels made by /generate1on1s, recognised by their topic."""
+    channels = category.text_channels if category else guild.text_channels
+    return [channel for channel in channels if (channel.topic or "").startswith(PAIR_TOPIC_PREFIX)]
+
+def transcript_line(message):
+    line = f"[{message.created_at:%Y-%m-%d %H:%M:%S}] {message.author} ({message.author.id}): {message.content}"
+    for attachment in message.attachments:
+        line += f"\n    📎 {attachment.url}"
+    if message.embeds:
+        line += f"\n    [{len(message.embeds)} embed(s)]"
+    return line + "\n"
+
+
+class TeardownJob:
+    """Archive then delete generated 1-on-1 channels.
+
+    Each channel's history is streamed page by page (discord.py fetches 100 messages
+    per request) into its own gzipped transcript, several channels at a time. Only
+    channels whose transcript was written completely are deleted, also concurrently.
+    """
+    def __init__(self, guild, channels):
+        self.guild = guild
+        self.channels = channels
+        self.directory = os.path.join(TRANSCRIPT_DIR, str(guild.id), time.strftime("%Y%m%d-%H%M%S"))
+        self.message_counts = {}  # channel_id: messages exported
+
+    async def export(self, channel):
+        category = channel.category.name if channel.category else "no-category"
+        path = os.path.join(self.directory, f"{re.sub(r'[^a-zA-Z0-9]', '', category.lower())}-{channel.name}-{channel.id}.txt.gz")
+        count = 0
+        try:
+            # Compression and disk writes would otherwise stall the gateway heartbeat on big teardowns
+            f = await asyncio.to_thread(gzip.open, path, "wt", encoding="utf-8")
+            try:
+                batch = [f"#{channel.name} ({channel.id}) in {category}\n{channel.topic}\n\n"]
+                async for message in channel.history(limit=None, oldest_first=True):
+                    batch.append(transcript_line(message))
+                    count += 1
+                    if len(batch) >= TRANSCRIPT_WRITE_BATCH:
+                        await asyncio.to_thread(f.write, "".join(batch))
+                        batch = []
+                await asyncio.to_thread(f.write, "".join(batch))
+            finally:
+                await asyncio.to_thread(f.close)
+        except Exception:
+            # A partial transcript would look complete in the archive
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        self.message_counts[channel.id] = count
+
+    def bundle(self):
+        """Pack the transcripts into one .tar next to them; returns its path."""
+        path = f"{self.directory}.tar"
+        with tarfile.open(path, "w") as tar:
+            tar.add(self.directory, arcname=os.path.basename(self.directory))
+        return path
+
+    async def run(self, interaction, user):
+        """Run the teardown, reporting progress and the result as followups to a deferred interaction."""
+        os.makedirs(self.directory, exist_ok=True)
+        total = len(self.channels)
+        title = f"📦 **Archiving {total} channels...**"
+        progress_msg = await interaction.followup.send(f"{title}\nProgress: 0/{total} (0%)", ephemeral=True)
+        exported = await run_bulk(self.channels, self.export, on_progress=ProgressMessage(progress_msg, title, total))
+
+        title = f"🗑️ **Deleting {len(exported.done)} archived channels...**"
+        deleted = await run_bulk(
+            exported.done,
+            lambda channel: channel.delete(reason=f"1-on-1 teardown by {user}"),
+            on_progress=ProgressMessage(progress_msg, title, len(exported.done))
+        )
+
+        text = "🗑️ **1-on-1 Teardown Complete!**\n\n"
+        text += f"📦 **Archived:** {len(exported.done)}/{total} channels ({sum(self.message_counts.values())} messages)\n"
+        text += f"✅ **Deleted:** {len(deleted.done)}/{total} channels\n"
+        text += f"📁 **Transcripts:** `{self.directory}`\n"
+        if exported.failed:
+            shown = ", ".join(f"{channel.name} ({str(e)[:50]})" for channel, e in exported.failed[:5])
+            text += f"\n❌ **Not archived, so kept:** {len(exported.failed)} channels: {shown}"
+            if len(exported.failed) > 5:
+                text += f" and {len(exported.failed) - 5} more"
+        if deleted.failed:
+            shown = ", ".join(f"{channel.name} ({str(e)[:50]})" for channel, e in deleted.failed[:5])
+            text += f"\n❌ **Archived but not deleted:** {len(deleted.failed)} channels: {shown}"
+
+        archive = None
+        if exported.done:
+            try:
+                archive = await asyncio.to_thread(self.bundle)
+            except Exception as e:
+                logger.error(f"Failed to bundle transcripts in {self.directory}: {e}")
+        if archive and os.path.getsize(archive) <= TRANSCRIPT_UPLOAD_LIMIT:
+            await interaction.followup.send(text, file=discord.File(archive), ephemeral=True)
+        else:
+            await interaction.followup.send(text, ephemeral=True)
+
+
+class TeardownConfirmView(discord.ui.View):
+    def __init__(self, channels, user):
+        super().__init__(timeout=120)
+        self.channels = channels
+        self.user = user
+
+    @discord.ui.button(label="📦 ARCHIVE & DELETE", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user != self.user:
+            await interaction.response.send_message("❌ Only the command user can confirm.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True)
+        self.stop()
+        await TeardownJob(interaction.guild, self.channels).run(interaction, interaction.user)
+
+    @discord.ui.button(label="❌ Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.stop()
+        await interaction.response.send_message("❌ Teardown cancelled. No channels were deleted.", ephemeral=True)
+
 
 class Generate1on1s(commands.Cog):
     def __init__(self, bot):
@@ -30,22 +500,64 @@ class Generate1on1s(commands.Cog):
 
         roles.sort(key=lambda x: x.name.lower())
         # Add mod role toggle option to setup view
-        view = Generate1on1SetupView(roles, interaction.guild)
+        checkpoint = load_checkpoints().get(str(interaction.guild.id))
+        view = Generate1on1SetupView(roles, interaction.guild, checkpoint=checkpoint)
+        description = ("**Step 1:** Click the button below to select roles for 1-on-1 channel creation.\n\n"
+                       "**Quick Select**: Pick a single role to create channels with selected other roles\n"
+                       "**Round Robin**: Create a channel for every pair of the selected roles\n\n"
+                       "**Mod Role Option:** Use the toggle below to add the mod role to all created channels.")
+        if checkpoint:
+            description += ("\n\n⚠️ **A previous run did not finish.** Use **Resume Interrupted Run** to create "
+                            "the missing channels; the ones already made are skipped.")
         embed = discord.Embed(
             title="🎯 Generate 1-on-1 Channels Setup",
-            description="**Step 1:** Click the button below to select roles for 1-on-1 channel creation.\n\n"
-                        "**Quick Select**: Pick a single role to create channels with selected other roles\n\n"
-                        "**Mod Role Option:** Use the toggle below to add the mod role to all created channels.",
+            description=description,
             color=discord.Color.blue()
         )
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
+    @commands.hybrid_command(name="teardown1on1s", description="Archive and delete the channels made by /generate1on1s.")
+    @app_commands.describe(category="Only tear down 1-on-1 channels in this category")
+    async def teardown1on1s(self, ctx, category: discord.CategoryChannel = None):
+        interaction = ctx.interaction if hasattr(ctx, "interaction") else ctx
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+        channels = find_pair_channels(interaction.guild, category)
+        if not channels:
+            await interaction.response.send_message("❌ No generated 1-on-1 channels found.", ephemeral=True)
+            return
+        per_category = {}
+        for channel in channels:
+            name = channel.category.name if channel.category else "No category"
+            per_category[name] = per_category.get(name, 0) + 1
+        embed = discord.Embed(
+            title="⚠️ **1-on-1 Channel Teardown**",
+            description=f"**Channels found:** {len(channels)} (by their 1-on-1 topic)\n\n"
+                        f"**This action will:**\n"
+                        f"• Save each channel's full message history as a compressed transcript\n"
+                        f"• Delete every channel whose transcript was saved\n"
+                        f"• Keep any channel that could not be archived\n\n"
+                        f"**⚠️ Deleted channels cannot be restored!**",
+            color=discord.Color.red()
+        )
+        lines = [f"📂 {name}: {count}" for name, count in list(per_category.items())[:15]]
+        if len(per_category) > 15:
+            lines.append(f"... and {len(per_category) - 15} more categories")
+        embed.add_field(name="Channels per Category", value="\n".join(lines), inline=False)
+        await interaction.response.send_message(embed=embed, view=TeardownConfirmView(channels, interaction.user), ephemeral=True)
+
 class Generate1on1SetupView(discord.ui.View):
-    def __init__(self, roles, guild):
+    def __init__(self, roles, guild, checkpoint=None):
         super().__init__(timeout=300)
         self.roles = roles
         self.guild = guild
         self.add_mod_role = False
+        self.checkpoint = checkpoint
+        if checkpoint:
+            resume_btn = discord.ui.Button(label="▶ Resume Interrupted Run", style=discord.ButtonStyle.success, row=0)
+            resume_btn.callback = self.resume_run
+            self.add_item(resume_btn)
         # Add a toggle button for mod role
         self.mod_role_toggle = discord.ui.Button(
             label="Add Mod Role to Channels: OFF",
@@ -55,6 +567,17 @@ class Generate1on1SetupView(discord.ui.View):
         self.mod_role_toggle.callback = self.toggle_mod_role
         self.add_item(self.mod_role_toggle)
 
+    async def resume_run(self, interaction: discord.Interaction):
+        job = GenerationJob.from_checkpoint(self.guild, self.checkpoint)
+        if job is None:
+            checkpoints = load_checkpoints()
+            checkpoints.pop(str(self.guild.id), None)
+            save_checkpoints(checkpoints)
+            await interaction.response.send_message("❌ Some roles or categories from the interrupted run no longer exist. Please set it up again.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True)
+        await job.run(interaction)
+
     async def toggle_mod_role(self, interaction: discord.Interaction):
         self.add_mod_role = not self.add_mod_role
         self.mod_role_toggle.label = f"Add Mod Role to Channels: {'ON' if self.add_mod_role else 'OFF'}"
@@ -72,6 +595,18 @@ class Generate1on1SetupView(discord.ui.View):
         )
         await interaction.response.edit_message(embed=embed, view=view)
 
+    @discord.ui.button(label="🔁 Round Robin (All Pairs)", style=discord.ButtonStyle.primary, row=0)
+    async def round_robin(self, interaction: discord.Interaction, button: discord.ui.Button):
+        view = RoundRobinSelectionView(self.roles, self.guild, add_mod_role=self.add_mod_role)
+        embed = discord.Embed(
+            title="🔁 Round Robin Mode",
+            description="Select the roles to pair up. **Every pair** of selected roles gets its own channel, "
+                        "so N roles make N·(N−1)/2 channels.\n\n"
+                        "You'll see the full plan (channels, categories and estimated time) before anything is created.",
+            color=discord.Color.green()
+        )
+        await interaction.response.edit_message(embed=embed, view=view)
+
 class QuickSelectView(discord.ui.View):
     def __init__(self, roles, guild, add_mod_role=False):
         super().__init__(timeout=300)
@@ -250,27 +785,54 @@ class TargetRoleSelectionView(discord.ui.View):
         if interaction.user != self.user:
             await interaction.response.send_message("❌ Only the command user can continue.", ephemeral=True)
             return
-        categories = interaction.guild.categories
-        if not categories:
+        if not interaction.guild.categories:
             await interaction.response.send_message("❌ No categories found in this server.", ephemeral=True)
             return
-        view = CategorySelectionView(self.main_role, self.selected_target_roles, categories, self.guild, add_mod_role=self.add_mod_role)
+        sorted_target_roles = sorted(self.selected_target_roles, key=lambda x: x.name.lower())
+        role_pairs = [(self.main_role, target_role) for target_role in sorted_target_roles]
+        header = (f"**Main Role:** {self.main_role.name}\n"
+                  f"**Target Roles:** {len(self.selected_target_roles)} selected")
+        await self.show_categories(interaction, role_pairs, header)
+
+    async def show_categories(self, interaction, role_pairs, header):
+        categories = interaction.guild.categories
+        view = CategorySelectionView(role_pairs, header, categories, self.guild, add_mod_role=self.add_mod_role)
         embed = discord.Embed(
             title="📂 Select Categories",
             description=f"Select categories where you want to create 1-on-1 channels.\n\n"
-                        f"**Main Role:** {self.main_role.name}\n"
-                        f"**Target Roles:** {len(self.selected_target_roles)} selected\n"
-                        f"**Channels per category:** {len(self.selected_target_roles)}\n\n"
-                        f"💡 **Tip:** Empty categories work perfectly for organizing new competition channels!",
+                        f"{header}\n"
+                        f"**Channels per category:** {len(role_pairs)}\n\n"
+                        f"💡 **Tip:** Empty categories work perfectly for organizing new competition channels! "
+                        f"Categories that fill up ({MAX_CATEGORY_CHANNELS} channels) continue in new overflow categories.",
             color=discord.Color.blue()
         )
         await interaction.response.edit_message(embed=embed, view=view)
 
+class RoundRobinSelectionView(TargetRoleSelectionView):
+    """Pick the roles for round-robin mode: every pair of them gets a channel."""
+    def __init__(self, roles, guild, add_mod_role=False):
+        super().__init__(None, roles, guild, add_mod_role=add_mod_role)
+
+    async def continue_to_categories(self, interaction: discord.Interaction):
+        if interaction.user != self.user:
+            await interaction.response.send_message("❌ Only the command user can continue.", ephemeral=True)
+            return
+        if len(self.selected_target_roles) < 2:
+            await interaction.response.send_message("❌ Select at least two roles for a round robin.", ephemeral=True)
+            return
+        if not interaction.guild.categories:
+            await interaction.response.send_message("❌ No categories found in this server.", ephemeral=True)
+            return
+        role_pairs = round_robin_pairs(self.selected_target_roles)
+        header = (f"**Mode:** Round robin (every pair)\n"
+                  f"**Roles:** {len(self.selected_target_roles)} selected")
+        await self.show_categories(interaction, role_pairs, header)
+
 class CategorySelectionView(discord.ui.View):
-    def __init__(self, main_role, target_roles, categories, guild, add_mod_role=False):
+    def __init__(self, role_pairs, header, categories, guild, add_mod_role=False):
         super().__init__(timeout=300)
-        self.main_role = main_role
-        self.target_roles = target_roles
+        self.role_pairs = role_pairs
+        self.header = header
         self.categories = categories
         self.guild = guild
         self.selected_categories = []
@@ -311,18 +873,19 @@ class CategorySelectionView(discord.ui.View):
         selected_ids = [int(cat_id) for cat_id in interaction2.data['values']]
         self.selected_categories = [self.guild.get_channel(cat_id) for cat_id in selected_ids]
         self.selected_categories = [cat for cat in self.selected_categories if cat is not None]
-        self.create_btn.disabled = False
+        # Preview the plan (from the channel cache, no requests) before anything runs
+        plan = GenerationJob(self.guild, self.role_pairs, self.selected_categories, self.add_mod_role).plan()
+        self.create_btn.disabled = plan.over_guild_limit
         category_info = []
         for cat in self.selected_categories:
             existing_count = len(cat.channels)
             category_info.append(f"📂 **{cat.name}** ({existing_count} existing)")
         embed = discord.Embed(
             title="📂 Categories Selected",
-            description=f"**Main Role:** {self.main_role.name}\n"
-                        f"**Target Roles:** {len(self.target_roles)} selected\n"
+            description=f"{self.header}\n"
                         f"**Categories:** {len(self.selected_categories)} selected\n\n"
                         f"**Selected Categories:**\n" + "\n".join(category_info) + "\n\n"
-                        f"**Total channels to create:** {len(self.target_roles) * len(self.selected_categories)}\n\n"
+                        f"**Plan:**\n{plan.preview()}\n\n"
                         f"⚠️ **Ready to create organized 1-on-1 channels for competitions!**",
             color=discord.Color.green()
         )
@@ -333,105 +896,8 @@ class CategorySelectionView(discord.ui.View):
             await interaction2.response.send_message("❌ Only the command user can create channels.", ephemeral=True)
             return
         await interaction2.response.defer(ephemeral=True)
-        total_channels = len(self.target_roles) * len(self.selected_categories)
-        created_count = 0
-        failed_count = 0
-        failed_channels = []
-        created_channels = []
-        progress_msg = await interaction2.followup.send(
-            f"🚀 **Creating {total_channels} channels...**\n"
-            f"Progress: 0/{total_channels} (0%)",
-            ephemeral=True
-        )
-        sorted_target_roles = sorted(self.target_roles, key=lambda x: x.name.lower())
-        for category in self.selected_categories:
-            category_created = []
-            for target_role in sorted_target_roles:
-                try:
-                    main_name = re.sub(r'[^a-zA-Z0-9]', '', self.main_role.name.lower())
-                    target_name = re.sub(r'[^a-zA-Z0-9]', '', target_role.name.lower())
-                    channel_name = f"{main_name}-{target_name}"
-                    if len(channel_name) > 100:
-                        channel_name = channel_name[:100]
-                    overwrites = {
-                        self.guild.default_role: discord.PermissionOverwrite(view_channel=False),
-                        self.main_role: discord.PermissionOverwrite(
-                            view_channel=True, 
-                            send_messages=True, 
-                            read_messages=True,
-                            read_message_history=True,
-                            attach_files=True,
-                            embed_links=True
-                        ),
-                        target_role: discord.PermissionOverwrite(
-                            view_channel=True, 
-                            send_messages=True, 
-                            read_messages=True,
-                            read_message_history=True,
-                            attach_files=True,
-                            embed_links=True
-                        ),
-                        self.guild.me: discord.PermissionOverwrite(
-                            view_channel=True, 
-                            send_messages=True, 
-                            read_messages=True,
-                            manage_messages=True
-                        )
-                    }
-                    # Add mod role if option is enabled and mod_role_id is set and exists in guild
-                    if self.add_mod_role and mod_role_id:
-                        mod_role = self.guild.get_role(mod_role_id)
-                        if mod_role:
-                            overwrites[mod_role] = discord.PermissionOverwrite(
-                                view_channel=True,
-                                send_messages=True,
-                                read_messages=True,
-                                read_message_history=True,
-                                manage_messages=True
-                            )
-                    channel = await category.create_text_channel(
-                        name=channel_name,
-                        overwrites=overwrites,
-                        reason=f"1-on-1 competition channel: {self.main_role.name} vs {target_role.name}",
-                        topic=f"Private 1-on-1 channel between {self.main_role.name} and {target_role.name}"
-                    )
-                    created_count += 1
-                    category_created.append(channel.name)
-                    if created_count % 5 == 0 or created_count <= 3:
-                        progress_percentage = int((created_count / total_channels) * 100)
-                        try:
-                            await progress_msg.edit(content=
-                                f"🚀 **Creating {total_channels} channels...**\n"
-                                f"Progress: {created_count}/{total_channels} ({progress_percentage}%)\n"
-                                f"Current: {channel_name} in {category.name}"
-                            )
-                        except:
-                            pass
-                    await asyncio.sleep(0.1)
-                except discord.Forbidden:
-                    failed_count += 1
-                    failed_channels.append(f"{main_name}-{target_name} in {category.name}: Missing permissions")
-                except Exception as e:
-                    failed_count += 1
-                    failed_channels.append(f"{main_name}-{target_name} in {category.name}: {str(e)[:50]}")
-            if category_created:
-                created_channels.append(f"📂 **{category.name}**: {len(category_created)} channels")
-        result_msg = f"✅ **1-on-1 Competition Channels Created!**\n\n"
-        result_msg += f"**Success:** {created_count}/{total_channels} channels created\n"
-        result_msg += f"**Main Role:** {self.main_role.name}\n"
-        result_msg += f"**Target Roles:** {len(self.target_roles)} roles (sorted alphabetically)\n\n"
-        if created_channels:
-            result_msg += "**Created in:**\n" + "\n".join(created_channels) + "\n\n"
-        if failed_count > 0:
-            result_msg += f"**Failed:** {failed_count} channels\n\n"
-            if len(failed_channels) <= 5:
-                result_msg += "**Failed channels:**\n" + "\n".join(failed_channels)
-            else:
-                result_msg += f"**Failed channels:**\n" + "\n".join(failed_channels[:5])
-                result_msg += f"\n... and {failed_count - 5} more"
-        result_msg += "\n🎮 **All channels created with proper permissions for competition use!**"
-        result_msg += "\n💡 **Tip:** Use `/sortcategory` if you need to reorder channels alphabetically."
-        await interaction2.followup.send(result_msg, ephemeral=True)
+        job = GenerationJob(self.guild, self.role_pairs, self.selected_categories, add_mod_role=self.add_mod_role)
+        await job.run(interaction2)
 
 # To add this cog to your bot:
 # bot.add_cog(Generate1on1s(bot))
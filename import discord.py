@@ -2,9 +2,9 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from bot.utils.helpers import logger, spin_wheel
+from bot.cogs.scheduler import scheduler
 import time
 import re
-import asyncio
 
 class FunCog(commands.Cog):
     """Fun/game commands (spin, eversnow, reflex, etc.)"""
@@ -249,14 +249,25 @@ class FunCog(commands.Cog):
         async def on_submit(self, interaction: discord.Interaction):
             try:
                 seconds = int(self.duration.value.strip())
-                if seconds < 5 or seconds > 86400:
-                    await interaction.response.send_message("❌ Duration must be between 5 and 86400 seconds (24h).", ephemeral=True)
-                    return
-                await interaction.response.send_message(f"⏳ Snapshot scheduled in {seconds} seconds! Results will be posted here.", ephemeral=True)
-                await asyncio.sleep(seconds)
-                await self.cog.send_vc_snapshot(interaction, self.channel)
-            except Exception as e:
-                await interaction.response.send_message(f"❌ Error: {e}", ephemeral=True)
+            except ValueError:
+                await interaction.response.send_message("❌ Duration must be a whole number of seconds.", ephemeral=True)
+                return
+            if seconds < 5 or seconds > 86400:
+                await interaction.response.send_message("❌ Duration must be between 5 and 86400 seconds (24h).", ephemeral=True)
+                return
+            # Handed to the shared scheduler instead of sleeping in the handler: the interaction
+            # token would expire long before a 24h timer and the result could only respond once.
+            job = scheduler.submit("vc_snapshot", interaction.guild_id, seconds, {
+                "target": f"vc:{self.channel.id}",
+                "post_channel_id": interaction.channel_id,
+                "requested_by": interaction.user.id,
+                "requested_by_name": interaction.user.display_name,
+                "timer": seconds,
+                "min_minutes": 0,
+            })
+            await interaction.response.send_message(
+                f"⏳ Snapshot #{job['id']} scheduled <t:{int(job['due'])}:R>! Results will be posted here.", ephemeral=True
+            )
 
 async def setup(bot):
     await bot.add_cog(FunCog(bot))
\ No newline at end of file
@@ -0,0 +1,61 @@
+import logging
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "!"
+
+
+class PrefixRouter:
+    """Dispatches "!verb args" text commands to handlers registered by cogs.
+
+    There is a single on_message listener for the whole bot. Messages that do not start
+    with PREFIX are dropped after one character comparison, and the rest cost one dict
+    lookup, so handlers never see (or pay for) ordinary chat.
+    """
+    def __init__(self, prefix=PREFIX):
+        self.prefix = prefix
+        self._handlers = {}  # verb: async handler(message, args)
+
+    def register(self, verb, handler):
+        verb = verb.lower()
+        if verb in self._handlers and self._handlers[verb] is not handler:
+            logger.warning(f"Prefix verb {self.prefix}{verb} re-registered")
+        self._handlers[verb] = handler
+
+    def unregister(self, verb):
+        self._handlers.pop(verb.lower(), None)
+
+    async def dispatch(self, message):
+        content = message.content
+        if not content or content[0] != self.prefix:
+            return False
+        if message.author.bot or message.guild is None:
+            return False
+        parts = content[1:].split(maxsplit=1)
+        if not parts:
+            return False
+        handler = self._handlers.get(parts[0].lower())
+        if handler is None:
+            return False
+        try:
+            await handler(message, parts[1] if len(parts) > 1 else "")
+        except Exception as e:
+            logger.error(f"Prefix command {self.prefix}{parts[0]} failed: {e}")
+        return True
+
+
+prefix_router = PrefixRouter()
+
+
+class PrefixRouterCog(commands.Cog):
+    """Owns the bot's one on_message listener for prefix commands."""
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        await prefix_router.dispatch(message)
+
+async def setup(bot):
+    await bot.add_cog(PrefixRouterCog(bot))
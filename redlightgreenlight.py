@@ -2,12 +2,524 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
+import heapq
+import json
+import logging
+import os
 import random
+import time
+from array import array
+from bot.cogs.bulk_ops import run_bulk
+
+logger = logging.getLogger(__name__)
+
+# Discord snowflakes count milliseconds from this epoch in their top 42 bits
+DISCORD_EPOCH_MS = 1420070400000
+# Default seconds players get to react each round; a round ends sooner once every live player has moved
+ROUND_SECONDS = 8
+# Games that may run at once in one server (each channel holds at most one)
+MAX_GAMES_PER_GUILD = 12
+# One append-only JSONL event log per game, for re-checking disputed eliminations
+RLGL_LOG_DIR = "rlgl_logs"
+# How clicks are answered: "quiet" only acknowledges, "round_end" also sends each clicker
+# their result after the round, "instant" replies to every click straight away
+CLICK_FEEDBACK_MODES = ("quiet", "round_end", "instant")
+# Round-end feedback followups sent at once
+FEEDBACK_CONCURRENCY = 10
+# Latest snapshot of each running game, one file per channel, for /rlgl_resume after a restart
+RLGL_STATE_DIR = "rlgl_games"
+
+
+def snowflake_ms(snowflake_id):
+    return (snowflake_id >> 22) + DISCORD_EPOCH_MS
+
+
+class RoundTimings:
+    """Click order and reaction times for one round, kept in parallel arrays.
+
+    `latency_ns` is measured with perf_counter_ns from when the round message was sent;
+    `snowflake_ms` is the gap between the message and interaction snowflakes, a
+    server-side cross-check that does not depend on our event loop. Rankings come
+    from one sort over the latency array.
+    """
+    __slots__ = ("user_ids", "latency_ns", "snowflake_ms")
+
+    def __init__(self):
+        self.user_ids = array("Q")
+        self.latency_ns = array("q")
+        self.snowflake_ms = array("q")
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def record(self, user_id, latency_ns, snowflake_ms=0):
+        self.user_ids.append(user_id)
+        self.latency_ns.append(latency_ns)
+        self.snowflake_ms.append(snowflake_ms)
+
+    def ranked(self):
+        """Indexes into the arrays, fastest first."""
+        return sorted(range(len(self.latency_ns)), key=self.latency_ns.__getitem__)
+
+    def slowest(self, n=1, exclude=()):
+        """User IDs of the `n` slowest clickers, slowest first, skipping `exclude`."""
+        out = []
+        for i in reversed(self.ranked()):
+            if self.user_ids[i] not in exclude:
+                out.append(self.user_ids[i])
+                if len(out) == n:
+                    break
+        return out
+
+    def leaderboard(self, n=10):
+        """[(user_id, latency_ns), ...] for the `n` fastest clickers."""
+        return [(self.user_ids[i], self.latency_ns[i]) for i in self.ranked()[:n]]
+
+    def percentiles(self, ps=(50, 90, 99)):
+        """{p: latency_ns} using nearest-rank over the sorted latencies."""
+        if not self.latency_ns:
+            return {}
+        ordered = sorted(self.latency_ns)
+        last = len(ordered) - 1
+        return {p: ordered[min(last, max(0, round(p / 100 * last)))] for p in ps}
+
+
+def draw_round(rng, round_type=None):
+    """(round_type, trick_is_green) for the next round, drawn from the game's own RNG.
+
+    Pass `round_type` when a mod picked it; only the trick outcome is drawn then. A trick
+    round has one outcome for everybody; it is None for other round types.
+    """
+    if round_type is None:
+        is_green = rng.choice([True, False, False])  # More reds than greens
+        trick = rng.random() < 0.15  # 15% chance of trick round
+        round_type = "trick" if trick else ("green" if is_green else "red")
+    trick_is_green = rng.choice([True, False]) if round_type == "trick" else None
+    return round_type, trick_is_green
+
+
+def judge_round(players, round_type, trick_is_green, timings, eliminate_slowest):
+    """User IDs that lose a life (or are out) this round, given who moved in `timings`."""
+    moved = set(timings.user_ids)
+    green = round_type == "green" or (round_type == "trick" and trick_is_green)
+    hit = [uid for uid, pdata in players.items() if not pdata["eliminated"] and (uid in moved) != green]
+    if eliminate_slowest and round_type == "green":
+        hit.extend(timings.slowest(1, exclude=set(hit)))
+    return hit
+
+
+def apply_hits(players, hit, lives_enabled):
+    """Take a life from (or eliminate) every player in `hit`; returns those now eliminated."""
+    out = []
+    for uid in hit:
+        pdata = players[uid]
+        if lives_enabled:
+            pdata["lives"] -= 1
+            if pdata["lives"] > 0:
+                continue
+        pdata["eliminated"] = True
+        out.append(uid)
+    return out
+
+
+class GameLog:
+    """Append-only event log of one game, kept in memory and mirrored to a JSONL file.
+
+    The first event records the seed, settings and players in join order; then each
+    round adds a "round" event (type and trick outcome), a "moves" event (clicks in
+    order with their latencies) and an "eliminations" event. Pass path=None to skip the file.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.events = []
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def append(self, event):
+        self.events.append(event)
+        if not self.path:
+            return
+        try:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write RLGL log {self.path}: {e}")
+
+    @staticmethod
+    def load(path):
+        with open(path, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def replay_game(events):
+    """Re-run a logged game from its seed and clicks, checking it against the log.
+
+    Randomized round types and trick outcomes are re-drawn from the seed; mod-picked
+    round types come from the log. A "resume" event rewinds to the round the game was
+    resumed from, as /rlgl_resume did. Returns {"rounds", "eliminated", "winners", "mismatches"},
+    where mismatches lists every round whose replayed outcome differs from what was logged.
+    """
+    start = events[0]
+    rng = random.Random(start["seed"])
+    players = {uid: {"lives": lives, "eliminated": False} for uid, lives in start["players"]}
+    eliminated = []
+    mismatches = []
+    rounds = 0
+    current = None
+    # (rng state, lives, eliminated count) after the last two finished rounds, for rewinding on resume
+    checkpoints = {0: (rng.getstate(), {uid: pdata["lives"] for uid, pdata in players.items()}, 0)}
+    for event in events[1:]:
+        kind = event["e"]
+        if kind == "resume":
+            rng_state, lives, count = checkpoints[event["round"]]
+            rng.setstate(rng_state)
+            for uid, pdata in players.items():
+                pdata["lives"] = lives[uid]
+            del eliminated[count:]
+            for pdata in players.values():
+                pdata["eliminated"] = False
+            for uid in eliminated:
+                players[uid]["eliminated"] = True
+            rounds = event["round"]
+        elif kind == "round":
+            rounds += 1
+            current = event
+            picked = event["type"] if start["control_mode"] == "manual" else None
+            round_type, trick_is_green = draw_round(rng, picked)
+            if (round_type, trick_is_green) != (event["type"], event["trick_green"]):
+                mismatches.append(f"Round {event['n']}: drew {round_type}/{trick_is_green}, log has {event['type']}/{event['trick_green']}")
+        elif kind == "moves":
+            timings = RoundTimings()
+            for uid, latency_ns in zip(event["uids"], event["ns"]):
+                timings.record(uid, latency_ns)
+            hit = judge_round(players, current["type"], current["trick_green"], timings, start["eliminate_slowest"])
+            out = apply_hits(players, hit, start["lives_enabled"])
+            eliminated.extend(out)
+        elif kind == "eliminations":
+            if hit != event["hit"] or out != event["out"]:
+                mismatches.append(f"Round {event['n']}: replay hit {hit} / out {out}, log has {event['hit']} / {event['out']}")
+            checkpoints[event["n"]] = (rng.getstate(), {uid: pdata["lives"] for uid, pdata in players.items()}, len(eliminated))
+            checkpoints.pop(event["n"] - 2, None)
+    return {
+        "rounds": rounds,
+        "eliminated": eliminated,
+        "winners": [uid for uid, pdata in players.items() if not pdata["eliminated"]],
+        "mismatches": mismatches,
+    }
+
+
+MESSAGE_LIMIT = 2000
+# Rounds shown in full on the game board; older ones are collapsed into one summary line
+BOARD_HISTORY_ROUNDS = 8
+ROUND_ICONS = {"green": "🟢", "red": "🔴", "trick": "🟡"}
+
+
+def split_message(prefix, items, sep=", ", limit=MESSAGE_LIMIT):
+    """Join `items` after `prefix` into as few messages as fit under `limit` characters."""
+    messages = []
+    current = prefix
+    first = True
+    for item in items:
+        piece = item if first else sep + item
+        if len(current) + len(piece) > limit and not first:
+            messages.append(current)
+            current, piece = "", item
+        current += piece
+        first = False
+    messages.append(current)
+    return messages
+
+
+class GameBoard:
+    """A single message that shows the whole game, edited once per round.
+
+    Recent rounds are listed with their eliminations; older rounds are folded into one
+    line, so the board stays under Discord's 2000 character limit however long the game runs.
+    """
+    def __init__(self, channel, title="🚦 **Red Light Green Light**"):
+        self.channel = channel
+        self.title = title
+        self.message = None
+        self.history = []  # recent round lines, oldest first
+        self.collapsed_rounds = 0
+        self.collapsed_eliminated = 0
+
+    def add_round(self, round_num, round_type, names, hit_count, note=""):
+        line = f"R{round_num} {ROUND_ICONS[round_type]} "
+        if names:
+            shown = split_message(f"💀 {hit_count}: ", names, limit=160)[0]
+            hidden = hit_count - shown.count(", ") - 1
+            line += shown + (f" +{hidden} more" if hidden > 0 else "")
+        else:
+            line += "✅ nobody out"
+        if note:
+            line += f" · {note}"
+        self.history.append((line, hit_count))
+        while len(self.history) > BOARD_HISTORY_ROUNDS:
+            _, count = self.history.pop(0)
+            self.collapsed_rounds += 1
+            self.collapsed_eliminated += count
+
+    def render(self, status, current=""):
+        lines = [self.title, status]
+        if self.collapsed_rounds:
+            lines.append(f"*Rounds 1–{self.collapsed_rounds}: {self.collapsed_eliminated} hits*")
+        lines.extend(line for line, _ in self.history)
+        if current:
+            lines.append("")
+            lines.append(current)
+        content = "\n".join(lines)
+        if len(content) > MESSAGE_LIMIT:
+            content = content[:MESSAGE_LIMIT - 1] + "…"
+        return content
+
+    async def show(self, content, view=None):
+        if self.message is None:
+            self.message = await self.channel.send(content, view=view)
+        else:
+            self.message = await self.message.edit(content=content, view=view)
+        return self.message
+
+
+class RoundTimerService:
+    """Ends rounds at their deadlines for every running game from a single task.
+
+    Games hand over the asyncio.Event their round waits on; the service sets it when
+    the deadline passes. Setting it earlier (everyone moved) is fine, the late set is a no-op.
+    """
+    def __init__(self):
+        self._heap = []  # (deadline, seq, event)
+        self._seq = 0
+        self._wakeup = None
+        self._task = None
+
+    def schedule(self, delay, event):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._seq += 1
+        heapq.heappush(self._heap, (loop.time() + delay, self._seq, event))
+        self._wakeup.set()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for _, _, event in self._heap:
+            event.set()
+        self._heap.clear()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            now = loop.time()
+            while self._heap and self._heap[0][0] <= now:
+                heapq.heappop(self._heap)[2].set()
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+round_timer = RoundTimerService()
+
+
+class MissingMember:
+    """Stand-in for a resumed player who is no longer in the member cache."""
+    def __init__(self, user_id):
+        self.id = user_id
+        self.mention = f"<@{user_id}>"
+        self.display_name = str(user_id)
+
+
+def snapshot_game(state):
+    """Compact, JSON-ready copy of a running game: settings plus flat ID/lives lists."""
+    ids = list(state.players)
+    players = state.players
+    return {
+        "guild": state.channel.guild.id,
+        "channel": state.channel.id,
+        "host": state.host.id,
+        "round": state.round,
+        "seed": state.seed,
+        "rng": state.rng.getstate(),
+        "log": state.log.path if state.log else None,
+        "settings": {
+            "allowed_roles": state.allowed_roles,
+            "max_eliminated": state.max_eliminated,
+            "lives_enabled": state.lives_enabled,
+            "lives_count": state.lives_count,
+            "eliminate_slowest": state.eliminate_slowest,
+            "round_seconds": state.round_seconds,
+            "control_mode": state.control_mode,
+            "render_mode": state.render_mode,
+            "click_feedback": state.click_feedback,
+        },
+        "players": ids,
+        "lives": [players[uid]["lives"] for uid in ids],
+        "eliminated": [uid for uid in ids if players[uid]["eliminated"]],
+    }
+
+
+class GameSnapshotStore:
+    """Keeps the latest snapshot of every running game on disk.
+
+    save() only builds the snapshot on the event loop; encoding and the atomic file
+    write run in a thread. Writes for a channel are chained, so an older snapshot (or a
+    discard) can never overtake a newer one.
+    """
+    def __init__(self, directory=RLGL_STATE_DIR):
+        self.directory = directory
+        self._writes = {}  # channel_id: latest write/delete task
+
+    def path(self, channel_id):
+        return os.path.join(self.directory, f"{channel_id}.json")
+
+    def save(self, state):
+        self._chain(state.channel.id, self._write_file, snapshot_game(state))
+
+    def discard(self, channel_id):
+        self._chain(channel_id, self._delete_file)
+
+    async def flush(self):
+        """Wait for every queued write to land."""
+        await asyncio.gather(*self._writes.values(), return_exceptions=True)
+
+    def _chain(self, channel_id, func, *args):
+        previous = self._writes.get(channel_id)
+        task = asyncio.create_task(self._run(channel_id, previous, func, *args))
+        self._writes[channel_id] = task
+
+    async def _run(self, channel_id, previous, func, *args):
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        try:
+            await asyncio.to_thread(func, channel_id, *args)
+        except Exception as e:
+            logger.error(f"Failed to update RLGL snapshot for channel {channel_id}: {e}")
+        if self._writes.get(channel_id) is asyncio.current_task():
+            del self._writes[channel_id]
+
+    def _write_file(self, channel_id, data):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(channel_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def _delete_file(self, channel_id):
+        if os.path.exists(self.path(channel_id)):
+            os.remove(self.path(channel_id))
+
+    def load(self, channel_id):
+        path = self.path(channel_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load {path}: {e}")
+            return None
+
+    def saved_channels(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [int(name[:-5]) for name in os.listdir(self.directory) if name.endswith(".json") and name[:-5].isdigit()]
+
 
 class RedLightGreenLight(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.active_games = {}  # guild_id: GameState
+        self.active_games = {}  # channel_id: GameState
+        self.snapshots = GameSnapshotStore()
+        self.resume_offered = set()  # channel IDs already told they can /rlgl_resume
+        self._tasks = set()  # fire-and-forget work; the loop only holds weak references to tasks
+
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def cog_unload(self):
+        for state in list(self.active_games.values()):
+            if state.round_task:
+                state.round_task.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        round_timer.stop()
+        # Snapshots stay on disk so the games can be resumed after a restart
+        await self.snapshots.flush()
+
+    async def cog_load(self):
+        if self.bot.is_ready():
+            self.spawn(self.offer_resumes())
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self.offer_resumes()
+
+    async def offer_resumes(self):
+        """Tell each channel with an interrupted game that it can be resumed."""
+        for channel_id in self.snapshots.saved_channels():
+            if channel_id in self.active_games or channel_id in self.resume_offered:
+                continue
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                self.snapshots.discard(channel_id)
+                continue
+            data = self.snapshots.load(channel_id)
+            if not data:
+                continue
+            self.resume_offered.add(channel_id)
+            live = len(data["players"]) - len(data["eliminated"])
+            try:
+                await channel.send(
+                    f"⚠️ A Red Light Green Light game here was interrupted after round {data['round']} "
+                    f"({live} players left). The host or a mod can continue it with `/rlgl_resume`."
+                )
+            except Exception as e:
+                logger.error(f"Failed to offer RLGL resume in #{channel}: {e}")
+
+    def restore_game(self, data, channel):
+        """GameState rebuilt from a snapshot, ready for run_game to carry on from the next round."""
+        guild = channel.guild
+        host = guild.get_member(data["host"]) or MissingMember(data["host"])
+        state = self.GameState(host=host, channel=channel)
+        for key, value in data["settings"].items():
+            setattr(state, key, value)
+        state.round = data["round"]
+        state.seed = data["seed"]
+        version, internal, gauss = data["rng"]
+        state.rng.setstate((version, tuple(internal), gauss))
+        if data.get("log"):
+            state.log = GameLog(data["log"])
+        out = set(data["eliminated"])
+        for uid, lives in zip(data["players"], data["lives"]):
+            state.players[uid] = {
+                "member": guild.get_member(uid) or MissingMember(uid),
+                "lives": lives,
+                "eliminated": uid in out
+            }
+        state.live_count = len(state.players) - len(out)
+        state.in_progress = True
+        return state
+
+    def games_in_guild(self, guild_id):
+        return sum(1 for state in self.active_games.values() if state.channel.guild.id == guild_id)
+
+    def check_can_start(self, channel):
+        """Error message if a new game cannot be set up in `channel`, else None."""
+        if channel.id in self.active_games:
+            return "A game is already running in this channel."
+        if self.games_in_guild(channel.guild.id) >= MAX_GAMES_PER_GUILD:
+            return f"This server already has {MAX_GAMES_PER_GUILD} games running. Wait for one to finish."
+        return None
 
     class GameState:
         def __init__(self, host, channel):
@@ -22,18 +534,26 @@ class RedLightGreenLight(commands.Cog):
             self.in_progress = False
             self.round = 0
             self.eliminated_count = 0
+            self.live_count = 0  # players not yet eliminated, kept up to date on join/elimination
+            self.round_seconds = ROUND_SECONDS
             self.join_message = None
             self.mod_view_message = None
             self.round_task = None
             self.control_mode = "random"  # or "manual"
             self.mod_control_user = None
+            self.render_mode = "messages"  # or "board": one message edited each round
+            self.click_feedback = "quiet"  # one of CLICK_FEEDBACK_MODES
+            self.seed = random.getrandbits(32)  # round types and trick outcomes come from this alone
+            self.rng = random.Random(self.seed)
+            self.log = None  # GameLog, opened when the game starts
 
     # --- Setup command ---
     @app_commands.command(name="redlightgreenlight", description="Start a Red Light Green Light game setup.")
     async def redlightgreenlight(self, interaction: discord.Interaction):
-        # Only allow one game per channel
-        if interaction.guild_id in self.active_games:
-            await interaction.response.send_message("A game is already running in this server.", ephemeral=True)
+        # Only allow one game per channel, and a limited number per server
+        error = self.check_can_start(interaction.channel)
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
             return
 
         # Setup menu view
@@ -51,6 +571,9 @@ class RedLightGreenLight(commands.Cog):
             self.eliminate_slowest = False
             self.max_eliminated = 1
             self.control_mode = "random"
+            self.round_seconds = ROUND_SECONDS
+            self.click_feedback = "quiet"
+            self.render_mode = "messages"
             self.setup_complete = False
 
             # Add role select
@@ -61,6 +584,10 @@ class RedLightGreenLight(commands.Cog):
             self.add_item(self.EliminateSlowestToggle(self))
             # Add max eliminated input
             self.add_item(self.MaxEliminatedInput(self))
+            # Add round length input
+            self.add_item(self.RoundLengthInput(self))
+            # Add board/messages rendering toggle
+            self.add_item(self.RenderModeToggle(self))
             # Add control mode select
             self.add_item(self.ControlModeSelect(self))
             # Add start/cancel buttons
@@ -151,6 +678,55 @@ class RedLightGreenLight(commands.Cog):
                 except:
                     await interaction.response.send_message("Invalid number.", ephemeral=True)
 
+        class RoundLengthInput(discord.ui.Button):
+            def __init__(self, parent):
+                super().__init__(label="Round Options", style=discord.ButtonStyle.primary)
+                self.parent = parent
+
+            async def callback(self, interaction: discord.Interaction):
+                await interaction.response.send_modal(self.parent.RoundLengthModal(self.parent))
+
+        class RoundLengthModal(discord.ui.Modal, title="Round Options"):
+            def __init__(self, parent):
+                super().__init__()
+                self.parent = parent
+                self.seconds_input = discord.ui.TextInput(
+                    label="Max seconds per round (3-60)", required=True, max_length=2,
+                    placeholder=str(ROUND_SECONDS), default=str(parent.round_seconds)
+                )
+                self.add_item(self.seconds_input)
+                self.feedback_input = discord.ui.TextInput(
+                    label="Click replies: quiet, round_end or instant", required=False, max_length=9,
+                    placeholder="quiet", default=parent.click_feedback
+                )
+                self.add_item(self.feedback_input)
+
+            async def on_submit(self, interaction: discord.Interaction):
+                feedback = (self.feedback_input.value or "quiet").strip().lower()
+                if feedback not in CLICK_FEEDBACK_MODES:
+                    await interaction.response.send_message(f"Click replies must be one of: {', '.join(CLICK_FEEDBACK_MODES)}.", ephemeral=True)
+                    return
+                try:
+                    seconds = int(self.seconds_input.value)
+                    self.parent.round_seconds = min(60, max(3, seconds))
+                    self.parent.click_feedback = feedback
+                    await interaction.response.send_message(
+                        f"Rounds last up to {self.parent.round_seconds}s (or until every player has moved). "
+                        f"Click replies: {feedback}.", ephemeral=True
+                    )
+                except:
+                    await interaction.response.send_message("Invalid number.", ephemeral=True)
+
+        class RenderModeToggle(discord.ui.Button):
+            def __init__(self, parent):
+                super().__init__(label="Display: Messages", style=discord.ButtonStyle.secondary)
+                self.parent = parent
+
+            async def callback(self, interaction: discord.Interaction):
+                self.parent.render_mode = "board" if self.parent.render_mode == "messages" else "messages"
+                self.label = "Display: Game Board" if self.parent.render_mode == "board" else "Display: Messages"
+                await interaction.response.edit_message(view=self.parent)
+
         class ControlModeSelect(discord.ui.Select):
             def __init__(self, parent):
                 options = [
@@ -189,6 +765,11 @@ class RedLightGreenLight(commands.Cog):
                 self.parent.stop()
 
     async def start_join_screen(self, interaction, setup_view):
+        # Another game may have been set up here while this setup menu was open
+        error = self.check_can_start(interaction.channel)
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
+            return
         # Create game state
         state = self.GameState(host=interaction.user, channel=interaction.channel)
         state.allowed_roles = setup_view.allowed_roles
@@ -197,7 +778,10 @@ class RedLightGreenLight(commands.Cog):
         state.eliminate_slowest = setup_view.eliminate_slowest
         state.max_eliminated = setup_view.max_eliminated
         state.control_mode = setup_view.control_mode
-        self.active_games[interaction.guild_id] = state
+        state.round_seconds = setup_view.round_seconds
+        state.click_feedback = setup_view.click_feedback
+        state.render_mode = setup_view.render_mode
+        self.active_games[interaction.channel.id] = state
 
         # Join screen view
         join_view = self.JoinView(self, state)
@@ -213,8 +797,28 @@ class RedLightGreenLight(commands.Cog):
             self.cog = cog
             self.state = state
 
+        def close_lobby(self):
+            # Only drop our own entry; the channel may already host a newer game
+            if self.cog.active_games.get(self.state.channel.id) is self.state:
+                del self.cog.active_games[self.state.channel.id]
+            self.stop()
+
+        async def on_timeout(self):
+            if self.state.in_progress:
+                return
+            # An abandoned lobby would otherwise block new games in this channel
+            self.close_lobby()
+            if self.state.join_message:
+                try:
+                    await self.state.join_message.edit(content="⌛ This Red Light Green Light lobby expired.", view=None)
+                except discord.HTTPException:
+                    pass
+
         @discord.ui.button(label="Join", style=discord.ButtonStyle.primary)
         async def join(self, interaction: discord.Interaction, button: discord.ui.Button):
+            if self.state.in_progress:
+                await interaction.response.send_message("The game has already started.", ephemeral=True)
+                return
             # Only allowed roles
             if not any(role.id in self.state.allowed_roles for role in interaction.user.roles):
                 await interaction.response.send_message("You are not allowed to join.", ephemeral=True)
@@ -227,6 +831,7 @@ class RedLightGreenLight(commands.Cog):
                 "lives": self.state.lives_count if self.state.lives_enabled else 1,
                 "eliminated": False
             }
+            self.state.live_count += 1
             await interaction.response.send_message("You joined the game!", ephemeral=True)
 
         @discord.ui.button(label="Start", style=discord.ButtonStyle.success)
@@ -235,12 +840,21 @@ class RedLightGreenLight(commands.Cog):
             if interaction.user != self.state.host and not interaction.user.guild_permissions.manage_guild:
                 await interaction.response.send_message("Only the host or a mod can start.", ephemeral=True)
                 return
+            if self.state.in_progress:
+                await interaction.response.send_message("The game is already running.", ephemeral=True)
+                return
+            if self.cog.active_games.get(self.state.channel.id) is not self.state:
+                # Ended with /endredlightgreenlight before it started
+                await interaction.response.send_message("This game was cancelled.", ephemeral=True)
+                self.stop()
+                return
             if len(self.state.players) < 2:
                 await interaction.response.send_message("Need at least 2 players.", ephemeral=True)
                 return
             self.state.in_progress = True
             await interaction.response.send_message("Game starting!", ephemeral=True)
-            await self.cog.run_game(self.state)
+            # Each game runs in its own task so the button callback returns right away
+            self.state.round_task = asyncio.create_task(self.cog.run_game_task(self.state))
 
         @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger)
         async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -249,14 +863,41 @@ class RedLightGreenLight(commands.Cog):
                 await interaction.response.send_message("Only the host or a mod can cancel.", ephemeral=True)
                 return
             await interaction.response.send_message("Game cancelled.", ephemeral=True)
-            self.cog.active_games.pop(interaction.guild_id, None)
-            self.stop()
+            self.close_lobby()
+
+    async def run_game_task(self, state):
+        try:
+            await self.run_game(state)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Red Light Green Light game in #{state.channel} failed: {e}")
+            try:
+                await state.channel.send("⚠️ The game stopped because of an error.")
+            except Exception:
+                pass
+        finally:
+            if self.active_games.get(state.channel.id) is state:
+                del self.active_games[state.channel.id]
 
     async def run_game(self, state):
         channel = state.channel
         players = state.players
-        eliminated = set()
-        round_num = 0
+        # A resumed game carries on from the round after its last snapshot
+        eliminated = {uid for uid, pdata in players.items() if pdata["eliminated"]}
+        round_num = state.round
+        board = GameBoard(channel) if state.render_mode == "board" else None
+        if state.log is None:
+            state.log = GameLog(os.path.join(RLGL_LOG_DIR, f"{channel.guild.id}-{channel.id}-{state.seed}.jsonl"))
+        if round_num:
+            state.log.append({"e": "resume", "round": round_num})
+        else:
+            state.log.append({
+                "e": "start", "seed": state.seed, "channel": channel.id, "control_mode": state.control_mode,
+                "lives_enabled": state.lives_enabled, "eliminate_slowest": state.eliminate_slowest,
+                "max_eliminated": state.max_eliminated,
+                "players": [[uid, pdata["lives"]] for uid, pdata in players.items()],
+            })
 
         while True:
             round_num += 1
@@ -274,17 +915,18 @@ class RedLightGreenLight(commands.Cog):
                 state.mod_view_message = mod_msg
                 # Wait for mod to pick round type
                 try:
-                    round_type = await mod_panel.wait_for_choice()
+                    picked = await mod_panel.wait_for_choice()
                 except asyncio.TimeoutError:
                     await channel.send("⏰ Mod did not select a round type in time. Ending game.")
-                    self.active_games.pop(channel.guild.id, None)
+                    self.active_games.pop(channel.id, None)
+                    self.snapshots.discard(channel.id)
                     break
                 await mod_msg.delete()
             else:
-                # Randomized round
-                is_green = random.choice([True, False, False])  # More reds than greens
-                trick = random.random() < 0.15  # 15% chance of trick round
-                round_type = "trick" if trick else ("green" if is_green else "red")
+                picked = None
+            # Randomized round types and every trick outcome come from the game's seeded RNG
+            round_type, trick_is_green = draw_round(state.rng, picked)
+            state.log.append({"e": "round", "n": round_num, "type": round_type, "trick_green": trick_is_green})
 
             # Announce round
             desc = {
@@ -293,84 +935,161 @@ class RedLightGreenLight(commands.Cog):
                 "trick": "🟡 **TRICK ROUND!** (Will it be green or red? 🤔)"
             }[round_type]
             view = self.RoundView(self, state, round_type)
-            msg = await channel.send(f"**Round {round_num}**\n{desc}", view=view)
-
-            # Wait for responses
-            await asyncio.sleep(8)
-            await msg.edit(view=None)
+            if board:
+                # The previous round's result goes out with this edit too
+                msg = await board.show(board.render(f"👥 {state.live_count} players left", f"**Round {round_num}**\n{desc}"), view)
+            else:
+                msg = await channel.send(f"**Round {round_num}**\n{desc}", view=view)
+            view.start(msg)
 
-            # Evaluate moves
-            moves = view.moves  # user_id: True if moved
-            round_eliminated = []
+            # Wait until every live player has moved or the round runs out
+            round_timer.schedule(state.round_seconds, view.round_over)
+            await view.round_over.wait()
+            view.close()
+            if not board:
+                await msg.edit(view=None)
 
-            for uid, pdata in players.items():
-                if pdata["eliminated"]:
-                    continue
-                moved = moves.get(uid, False)
-                if round_type == "green":
-                    if not moved:
-                        round_eliminated.append(uid)
-                elif round_type == "red":
-                    if moved:
-                        round_eliminated.append(uid)
-                elif round_type == "trick":
-                    # Trick: randomly decide if it's green or red for this round
-                    trick_is_green = random.choice([True, False])
-                    if trick_is_green:
-                        if not moved:
-                            round_eliminated.append(uid)
-                    else:
-                        if moved:
-                            round_eliminated.append(uid)
-
-            # Eliminate slowest if enabled
-            if state.eliminate_slowest and round_type == "green":
-                if moves:
-                    slowest = max(moves.items(), key=lambda x: x[1])[0]
-                    if slowest not in round_eliminated:
-                        round_eliminated.append(slowest)
-
-            # Handle lives/elimination
-            for uid in round_eliminated:
-                pdata = players[uid]
-                if state.lives_enabled:
-                    pdata["lives"] -= 1
-                    if pdata["lives"] <= 0:
-                        pdata["eliminated"] = True
-                        eliminated.add(uid)
-                else:
-                    pdata["eliminated"] = True
-                    eliminated.add(uid)
+            # Evaluate moves (view.timings holds every click, in order)
+            timings = view.timings
+            state.log.append({"e": "moves", "n": round_num, "uids": timings.user_ids.tolist(), "ns": timings.latency_ns.tolist()})
+            round_eliminated = judge_round(players, round_type, trick_is_green, timings, state.eliminate_slowest)
+            out = apply_hits(players, round_eliminated, state.lives_enabled)
+            eliminated.update(out)
+            state.live_count -= len(out)
+            state.log.append({"e": "eliminations", "n": round_num, "hit": round_eliminated, "out": out})
+            state.round = round_num
+            self.snapshots.save(state)
+            if view.interactions:
+                # Followups go to the interaction webhooks; don't hold up the next round for them
+                self.spawn(self.send_round_feedback(state, view, round_eliminated, out))
 
             # Announce eliminated
-            if round_eliminated:
-                elim_names = [players[uid]["member"].mention for uid in round_eliminated]
-                await channel.send(f"💀 Eliminated this round: {', '.join(elim_names)}")
+            elim_names = [players[uid]["member"].mention for uid in round_eliminated]
+            stats = ""
+            notes = []
+            if round_type == "trick":
+                stats = f"🟡 The trick round was {'🟢 green' if trick_is_green else '🔴 red'}!"
+                notes.append("was 🟢" if trick_is_green else "was 🔴")
+            if round_type != "red" and len(timings):
+                fastest_id, fastest_ns = timings.leaderboard(1)[0]
+                median_ns = timings.percentiles((50,))[50]
+                stats = "\n".join(filter(None, [stats, (
+                    f"⏱️ Fastest: {players[fastest_id]['member'].mention} ({fastest_ns / 1e9:.3f}s) · "
+                    f"Median: {median_ns / 1e9:.3f}s · {len(timings)} moved"
+                )]))
+                notes.append(f"⏱️ {median_ns / 1e9:.2f}s median")
+            game_over = len(eliminated) >= state.max_eliminated or state.live_count <= 1
+            if board:
+                board.add_round(round_num, round_type, elim_names, len(round_eliminated), " · ".join(notes))
+                if state.control_mode == "manual" and not game_over:
+                    # The board would otherwise keep showing the old round while the mod picks
+                    await board.show(board.render(f"👥 {state.live_count} players left", "⏳ Waiting for the next round..."))
             else:
-                await channel.send("✅ No one eliminated this round!")
+                if elim_names:
+                    chunks = split_message("💀 Eliminated this round: ", elim_names)
+                else:
+                    chunks = ["✅ No one eliminated this round!"]
+                if stats:
+                    if len(chunks[-1]) + 1 + len(stats) <= MESSAGE_LIMIT:
+                        chunks[-1] += f"\n{stats}"
+                    else:
+                        chunks.append(stats)
+                for chunk in chunks:
+                    await channel.send(chunk)
 
             # Check end conditions
-            if len(eliminated) >= state.max_eliminated or sum(not p["eliminated"] for p in players.values()) <= 1:
+            if game_over:
                 winners = [p["member"].mention for p in players.values() if not p["eliminated"]]
-                await channel.send(f"🏁 **Game Over!**\nWinners: {', '.join(winners) if winners else 'None'}")
-                self.active_games.pop(channel.guild.id, None)
+                state.log.append({"e": "end", "rounds": round_num, "winners": [uid for uid, p in players.items() if not p["eliminated"]]})
+                if state.log.path:
+                    logger.info(f"Red Light Green Light game in #{channel} logged to {state.log.path} (seed {state.seed})")
+                if board:
+                    await board.show(board.render(f"🏁 **Game Over!** {len(winners)} winner(s)"))
+                for chunk in split_message("🏁 **Game Over!**\nWinners: ", winners or ["None"]):
+                    await channel.send(chunk)
+                self.active_games.pop(channel.id, None)
+                self.snapshots.discard(channel.id)
                 break
 
+    async def send_round_feedback(self, state, view, hit, out):
+        """Tell everyone who clicked this round how it went, one ephemeral followup each."""
+        hit, out = set(hit), set(out)
+
+        def feedback(user_id):
+            if user_id in out:
+                return "💀 You moved and were eliminated."
+            if user_id in hit:
+                return f"💔 You moved and lost a life ({state.players[user_id]['lives']} left)."
+            return f"✅ You moved in {view.moves[user_id] / 1e9:.3f}s and are safe."
+
+        result = await run_bulk(
+            list(view.interactions.items()),
+            lambda item: item[1].followup.send(feedback(item[0]), ephemeral=True),
+            concurrency=FEEDBACK_CONCURRENCY
+        )
+        if result.failed:
+            logger.warning(f"Round feedback failed for {len(result.failed)} of {result.total} players in #{state.channel}")
+
     class RoundView(discord.ui.View):
         def __init__(self, cog, state, round_type):
-            super().__init__(timeout=8)
+            super().__init__(timeout=state.round_seconds)
             self.cog = cog
             self.state = state
             self.round_type = round_type
-            self.moves = {}  # user_id: True if moved
+            self.live_count = state.live_count
+            self.round_over = asyncio.Event()  # set when everyone has moved or by round_timer
+            self.closed = False
+            self.moves = {}  # user_id: latency_ns of their first click
+            self.interactions = {}  # user_id: click interaction, kept for round-end feedback
+            self.timings = RoundTimings()
+            self.sent_ns = None
+            self.message_ms = None
+
+        def start(self, message):
+            """Start the reaction clock; call as soon as the round message has been sent."""
+            self.sent_ns = time.perf_counter_ns()
+            # A reused game-board message was created rounds ago; use its edit time instead
+            if getattr(message, "edited_at", None):
+                self.message_ms = int(message.edited_at.timestamp() * 1000)
+            else:
+                self.message_ms = snowflake_ms(message.id)
+
+        def close(self):
+            """Stop accepting clicks; the round is being evaluated."""
+            self.closed = True
+            self.stop()
 
         @discord.ui.button(label="Move!", style=discord.ButtonStyle.success)
         async def move(self, interaction: discord.Interaction, button: discord.ui.Button):
-            if interaction.user.id not in self.state.players or self.state.players[interaction.user.id]["eliminated"]:
+            clicked_ns = time.perf_counter_ns()
+            user_id = interaction.user.id
+            instant = self.state.click_feedback == "instant"
+            # Repeat clicks are checked first: they are the bulk of the traffic in a busy round
+            if user_id in self.moves:
+                if instant:
+                    await interaction.response.send_message("You already moved!", ephemeral=True)
+                else:
+                    await interaction.response.defer()
+                return
+            if self.closed:
+                await interaction.response.send_message("This round is over.", ephemeral=True)
+                return
+            if user_id not in self.state.players or self.state.players[user_id]["eliminated"]:
                 await interaction.response.send_message("You are not in the game or already eliminated.", ephemeral=True)
                 return
-            self.moves[interaction.user.id] = True
-            await interaction.response.send_message("You moved!", ephemeral=True)
+            latency_ns = clicked_ns - self.sent_ns if self.sent_ns is not None else 0
+            gap_ms = snowflake_ms(interaction.id) - self.message_ms if self.message_ms is not None else 0
+            self.moves[user_id] = latency_ns
+            self.timings.record(user_id, latency_ns, gap_ms)
+            if len(self.moves) >= self.live_count:
+                self.round_over.set()
+            if instant:
+                await interaction.response.send_message("You moved!", ephemeral=True)
+                return
+            if self.state.click_feedback == "round_end":
+                self.interactions[user_id] = interaction
+            # Deferred update: acknowledges the click without posting anything
+            await interaction.response.defer()
 
     class ModRoundControlView(discord.ui.View):
         def __init__(self, cog, state):
@@ -420,17 +1139,41 @@ class RedLightGreenLight(commands.Cog):
             return await asyncio.wait_for(self._waiter, timeout=30)
 
     # --- End/Cancel command for mods ---
-    @app_commands.command(name="endredlightgreenlight", description="End or cancel the current Red Light Green Light game.")
+    @app_commands.command(name="endredlightgreenlight", description="End or cancel the Red Light Green Light game in this channel.")
     async def endredlightgreenlight(self, interaction: discord.Interaction):
-        state = self.active_games.get(interaction.guild_id)
+        state = self.active_games.get(interaction.channel_id)
         if not state:
-            await interaction.response.send_message("No game is running.", ephemeral=True)
+            await interaction.response.send_message("No game is running in this channel.", ephemeral=True)
             return
         if interaction.user != state.host and not interaction.user.guild_permissions.manage_guild:
             await interaction.response.send_message("Only the host or a mod can end the game.", ephemeral=True)
             return
-        self.active_games.pop(interaction.guild_id, None)
+        self.active_games.pop(interaction.channel_id, None)
+        if state.round_task:
+            state.round_task.cancel()
+        self.snapshots.discard(interaction.channel_id)
         await interaction.response.send_message("Game ended.", ephemeral=True)
 
+    @app_commands.command(name="rlgl_resume", description="Resume a Red Light Green Light game interrupted by a restart.")
+    async def rlgl_resume(self, interaction: discord.Interaction):
+        data = self.snapshots.load(interaction.channel_id)
+        if not data:
+            await interaction.response.send_message("No interrupted game to resume in this channel.", ephemeral=True)
+            return
+        if interaction.user.id != data["host"] and not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("Only the host or a mod can resume the game.", ephemeral=True)
+            return
+        error = self.check_can_start(interaction.channel)
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
+            return
+        state = self.restore_game(data, interaction.channel)
+        self.active_games[interaction.channel_id] = state
+        self.resume_offered.discard(interaction.channel_id)
+        await interaction.response.send_message(
+            f"♻️ Resuming Red Light Green Light after round {state.round} with {state.live_count} players left!"
+        )
+        state.round_task = asyncio.create_task(self.run_game_task(state))
+
 async def setup(bot):
     await bot.add_cog(RedLightGreenLight(bot))
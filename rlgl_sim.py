@@ -0,0 +1,318 @@
+"""Headless simulation and benchmark harness for Red Light Green Light.
+
+Drives RedLightGreenLight.run_game against fake channels, messages and interactions
+with thousands of synthetic players, then reports per-round evaluation time, REST
+calls the game would have made, memory per player and event-loop lag, and checks
+that lives and eliminations add up and that the game log replays to the same result.
+Nothing talks to Discord. With --replay it re-checks a logged game instead.
+
+    python -m bot.cogs.rlgl_sim --players 1000 --lives 3 --max-eliminated 900 --board
+    python -m bot.cogs.rlgl_sim --replay rlgl_logs/<guild>-<channel>-<seed>.jsonl
+"""
+import asyncio
+import argparse
+import datetime
+import itertools
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from bot.cogs.redlightgreenlight import (
+    RedLightGreenLight, GameLog, GameSnapshotStore, replay_game, CLICK_FEEDBACK_MODES, DISCORD_EPOCH_MS, ROUND_SECONDS
+)
+
+_snowflake_seq = itertools.count()
+
+
+def fake_snowflake():
+    ms = int(time.time() * 1000) - DISCORD_EPOCH_MS
+    return (ms << 22) | (next(_snowflake_seq) & 0x3FFFFF)
+
+
+class FakeMember:
+    __slots__ = ("id", "display_name", "mention", "guild_permissions")
+
+    def __init__(self, member_id):
+        self.id = member_id
+        self.display_name = f"player{member_id}"
+        self.mention = f"<@{member_id}>"
+        self.guild_permissions = SimpleNamespace(manage_guild=False)
+
+
+class FakeResponse:
+    def __init__(self, counters):
+        self.counters = counters
+
+    async def send_message(self, *args, **kwargs):
+        self.counters["interaction_responses"] += 1
+
+    async def defer(self, *args, **kwargs):
+        self.counters["interaction_defers"] += 1
+
+    async def edit_message(self, *args, **kwargs):
+        self.counters["interaction_responses"] += 1
+
+
+class FakeFollowup:
+    def __init__(self, counters):
+        self.counters = counters
+
+    async def send(self, *args, **kwargs):
+        self.counters["followups"] += 1
+
+
+class FakeInteraction:
+    def __init__(self, user, counters):
+        self.id = fake_snowflake()
+        self.user = user
+        self.response = FakeResponse(counters)
+        self.followup = FakeFollowup(counters)
+
+
+class FakeMessage:
+    def __init__(self, channel, content, view):
+        self.id = fake_snowflake()
+        self.channel = channel
+        self.content = content
+        self.view = view
+        self.edited_at = None
+
+    async def edit(self, content=None, view=None, **kwargs):
+        self.channel.record("edits", content, view)
+        if content is not None:
+            self.content = content
+        self.view = view
+        self.edited_at = datetime.datetime.now(datetime.timezone.utc)
+        return self
+
+    async def delete(self):
+        self.channel.counters["deletes"] += 1
+
+
+class FakeChannel:
+    """Collects everything the game posts and starts synthetic clicks for each round view."""
+    def __init__(self, sim):
+        self.id = fake_snowflake()
+        self.guild = SimpleNamespace(id=fake_snowflake())
+        self.sim = sim
+        self.counters = sim.counters
+
+    def __str__(self):
+        return "simulation"
+
+    def record(self, kind, content, view):
+        self.counters[kind] += 1
+        if content and len(content) > 2000:
+            self.sim.errors.append(f"Message over 2000 characters ({len(content)})")
+        if content is not None:
+            # Edits that only remove buttons happen before a round is evaluated
+            self.sim.output_posted()
+        if view is not None and hasattr(view, "round_over"):
+            self.sim.start_round(view)
+
+    async def send(self, content=None, view=None, **kwargs):
+        message = FakeMessage(self, content, view)
+        self.record("sends", content, view)
+        return message
+
+
+class Simulation:
+    """One simulated game. Reaction times are log-normal (seconds, before time scaling)."""
+    def __init__(self, players=1000, lives=1, max_eliminated=None, round_seconds=0.5, board=False,
+                 eliminate_slowest=False, click_feedback="quiet", reaction_median=1.2, reaction_sigma=0.5,
+                 p_click_green=0.97, p_click_red=0.04, p_click_trick=0.5, seed=None):
+        self.player_count = players
+        self.lives = lives
+        self.max_eliminated = max_eliminated or players
+        self.round_seconds = round_seconds
+        self.board = board
+        self.eliminate_slowest = eliminate_slowest
+        self.click_feedback = click_feedback
+        self.reaction_median = reaction_median
+        self.reaction_sigma = reaction_sigma
+        self.click_chance = {"green": p_click_green, "red": p_click_red, "trick": p_click_trick}
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.counters = {"sends": 0, "edits": 0, "deletes": 0, "interaction_responses": 0, "interaction_defers": 0, "followups": 0, "clicks": 0}
+        self.errors = []
+        self.round_eval_ms = []
+        self.snapshot_ms = []
+        self.loop_lag_ms = []
+        self._click_handles = []
+        self._round_ended = None
+
+    def start_round(self, view):
+        """Schedule every live player's click (or non-click) for a freshly shown round."""
+        loop = asyncio.get_running_loop()
+        # Reaction times were modelled for the default round length; squeeze them to fit
+        scale = self.round_seconds / ROUND_SECONDS
+        chance = self.click_chance[view.round_type]
+        for uid, pdata in view.state.players.items():
+            if pdata["eliminated"] or self.rng.random() >= chance:
+                continue
+            delay = self.rng.lognormvariate(0, self.reaction_sigma) * self.reaction_median * scale
+            self._click_handles.append(loop.call_later(delay, self._click, view, pdata["member"]))
+        # run_game closes the view the moment the round is over, right before evaluating it
+        close = view.close
+
+        def timed_close():
+            self._round_ended = time.perf_counter()
+            close()
+        view.close = timed_close
+
+    def output_posted(self):
+        """Evaluation of the last round is done when the game next posts or edits something."""
+        if self._round_ended is not None:
+            self.round_eval_ms.append((time.perf_counter() - self._round_ended) * 1000)
+            self._round_ended = None
+
+    def _click(self, view, member):
+        self.counters["clicks"] += 1
+        asyncio.ensure_future(view.move.callback(FakeInteraction(member, self.counters)))
+
+    async def _measure_lag(self, interval=0.01):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_lag_ms.append((time.perf_counter() - start - interval) * 1000)
+
+    def check_accounting(self, state):
+        live = [p for p in state.players.values() if not p["eliminated"]]
+        if state.live_count != len(live):
+            self.errors.append(f"live_count {state.live_count} != {len(live)} players not eliminated")
+        for uid, p in state.players.items():
+            if state.lives_enabled and p["eliminated"] != (p["lives"] <= 0):
+                self.errors.append(f"Player {uid} has {p['lives']} lives but eliminated={p['eliminated']}")
+            if p["lives"] < 0:
+                self.errors.append(f"Player {uid} has negative lives")
+
+    async def run(self):
+        cog = RedLightGreenLight(None)
+        channel = FakeChannel(self)
+        host = FakeMember(1)
+        state = cog.GameState(host=host, channel=channel)
+        state.lives_enabled = self.lives > 1
+        state.lives_count = self.lives
+        state.max_eliminated = self.max_eliminated
+        state.eliminate_slowest = self.eliminate_slowest
+        state.round_seconds = self.round_seconds
+        state.render_mode = "board" if self.board else "messages"
+        state.click_feedback = self.click_feedback
+        if self.seed is not None:
+            state.seed = self.seed
+            state.rng = random.Random(self.seed)
+        state.log = GameLog(None)
+        snapshot_dir = tempfile.TemporaryDirectory()
+        cog.snapshots = GameSnapshotStore(snapshot_dir.name)
+        save = cog.snapshots.save
+
+        def timed_save(state):
+            # Only the part on the event loop counts; the write itself runs in a thread
+            started = time.perf_counter()
+            save(state)
+            self.snapshot_ms.append((time.perf_counter() - started) * 1000)
+        cog.snapshots.save = timed_save
+
+        tracemalloc.start()
+        base = tracemalloc.take_snapshot()
+        for uid in range(10, 10 + self.player_count):
+            state.players[uid] = {"member": FakeMember(uid), "lives": self.lives, "eliminated": False}
+        state.live_count = self.player_count
+        after_join = tracemalloc.take_snapshot()
+        join_bytes = sum(s.size_diff for s in after_join.compare_to(base, "filename"))
+        tracemalloc.reset_peak()
+
+        cog.active_games[channel.id] = state
+        state.in_progress = True
+        lag_task = asyncio.create_task(self._measure_lag())
+        started = time.perf_counter()
+        try:
+            await cog.run_game(state)
+            # Let the last round's feedback followups go out
+            await asyncio.sleep(0.01)
+        finally:
+            lag_task.cancel()
+            for handle in self._click_handles:
+                handle.cancel()
+            await cog.snapshots.flush()
+            snapshot_dir.cleanup()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.check_accounting(state)
+        replayed = replay_game(state.log.events)
+        self.errors.extend(replayed["mismatches"])
+        if replayed["winners"] != [uid for uid, p in state.players.items() if not p["eliminated"]]:
+            self.errors.append("Replaying the game log gives different winners")
+
+        rounds = len(self.round_eval_ms)
+        lag = sorted(self.loop_lag_ms) or [0.0]
+        return {
+            "players": self.player_count,
+            "rounds": rounds,
+            "seconds": round(elapsed, 2),
+            "seed": state.seed,
+            "survivors": state.live_count,
+            "eval_ms_median": round(statistics.median(self.round_eval_ms), 3) if rounds else None,
+            "eval_ms_max": round(max(self.round_eval_ms), 3) if rounds else None,
+            "snapshot_ms_median": round(statistics.median(self.snapshot_ms), 3) if self.snapshot_ms else None,
+            "snapshot_ms_max": round(max(self.snapshot_ms), 3) if self.snapshot_ms else None,
+            "messages_sent": self.counters["sends"],
+            "messages_edited": self.counters["edits"],
+            "messages_deleted": self.counters["deletes"],
+            "interaction_responses": self.counters["interaction_responses"],
+            "interaction_defers": self.counters["interaction_defers"],
+            "followups": self.counters["followups"],
+            "rest_calls_per_round": round(sum(self.counters[k] for k in ("sends", "edits", "deletes", "interaction_responses", "interaction_defers", "followups")) / max(rounds, 1), 1),
+            "messages_per_round": round(sum(self.counters[k] for k in ("sends", "interaction_responses", "followups")) / max(rounds, 1), 1),
+            "bytes_per_player_joined": join_bytes // self.player_count,
+            "peak_bytes_per_player": peak // self.player_count,
+            "loop_lag_ms_p99": round(lag[min(len(lag) - 1, int(len(lag) * 0.99))], 3),
+            "loop_lag_ms_max": round(lag[-1], 3),
+            "errors": self.errors,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a Red Light Green Light game offline.")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--lives", type=int, default=1)
+    parser.add_argument("--max-eliminated", type=int, default=None)
+    parser.add_argument("--round-seconds", type=float, default=0.5)
+    parser.add_argument("--board", action="store_true", help="Use the single game-board message display")
+    parser.add_argument("--eliminate-slowest", action="store_true")
+    parser.add_argument("--click-feedback", choices=CLICK_FEEDBACK_MODES, default="quiet")
+    parser.add_argument("--reaction-median", type=float, default=1.2, help="Median reaction time in seconds")
+    parser.add_argument("--reaction-sigma", type=float, default=0.5, help="Log-normal spread of reaction times")
+    parser.add_argument("--p-click-green", type=float, default=0.97)
+    parser.add_argument("--p-click-red", type=float, default=0.04)
+    parser.add_argument("--p-click-trick", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--replay", metavar="LOG", help="Replay a game log and check it instead of simulating")
+    args = parser.parse_args()
+    if args.replay:
+        result = replay_game(GameLog.load(args.replay))
+        print(f"{'rounds':>24}: {result['rounds']}")
+        print(f"{'eliminated':>24}: {len(result['eliminated'])}")
+        print(f"{'winners':>24}: {result['winners']}")
+        print(f"{'mismatches':>24}: {len(result['mismatches'])}")
+        for mismatch in result["mismatches"]:
+            print(mismatch)
+        return
+    sim = Simulation(
+        players=args.players, lives=args.lives, max_eliminated=args.max_eliminated,
+        round_seconds=args.round_seconds, board=args.board, eliminate_slowest=args.eliminate_slowest,
+        click_feedback=args.click_feedback,
+        reaction_median=args.reaction_median, reaction_sigma=args.reaction_sigma,
+        p_click_green=args.p_click_green, p_click_red=args.p_click_red, p_click_trick=args.p_click_trick,
+        seed=args.seed
+    )
+    report = asyncio.run(sim.run())
+    for key, value in report.items():
+        print(f"{key:>24}: {value}")
+
+
+if __name__ == "__main__":
+    main()
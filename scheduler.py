@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import heapq
+import asyncio
+import logging
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
+# Pending jobs survive restarts here
+SCHEDULE_FILE = "scheduled_jobs.json"
+# How long a due job waits for its handler to be registered (cog still loading)
+HANDLER_RETRY_DELAY = 60
+
+
+class JobScheduler:
+    """Durable one-shot jobs run by a single timer task.
+
+    Jobs are plain dicts ({"id", "kind", "guild_id", "due", "created", "payload"}) kept in
+    SCHEDULE_FILE and a heap ordered by due time. Cogs register a handler per job kind;
+    at the due time the handler is called with the bot and the job. Handlers must work
+    from IDs in the payload, since the interaction that created the job is long gone.
+    """
+    def __init__(self, path=SCHEDULE_FILE):
+        self.path = path
+        self.jobs = {}  # job_id: job
+        self._heap = []  # (due, job_id)
+        self._handlers = {}  # kind: async handler(bot, job)
+        self._next_id = 1
+        self._loaded = False
+        self._wakeup = None
+        self._task = None
+        self._running = set()  # jobs being executed; the loop only holds weak references to tasks
+
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load {self.path}: {e}")
+            return
+        for job in data.get("jobs", []):
+            self.jobs[job["id"]] = job
+            heapq.heappush(self._heap, (job["due"], job["id"]))
+        self._next_id = max(data.get("next_id", 1), max(self.jobs, default=0) + 1)
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"next_id": self._next_id, "jobs": list(self.jobs.values())}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save {self.path}: {e}")
+
+    def register(self, kind, handler):
+        self._handlers[kind] = handler
+
+    def unregister(self, kind):
+        self._handlers.pop(kind, None)
+
+    def submit(self, kind, guild_id, delay, payload):
+        self.load()
+        now = time.time()
+        job = {
+            "id": self._next_id,
+            "kind": kind,
+            "guild_id": guild_id,
+            "due": now + delay,
+            "created": now,
+            "payload": payload,
+        }
+        self._next_id += 1
+        self.jobs[job["id"]] = job
+        heapq.heappush(self._heap, (job["due"], job["id"]))
+        self._save()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def cancel(self, job_id, guild_id=None, kind=None):
+        """Remove a pending job; returns it, or None if there was no such job of that kind in that guild."""
+        self.load()
+        job = self.jobs.get(job_id)
+        if job is None or (guild_id is not None and job["guild_id"] != guild_id) or (kind is not None and job["kind"] != kind):
+            return None
+        del self.jobs[job_id]
+        self._save()
+        # The heap entry is skipped lazily when it comes due
+        return job
+
+    def pending(self, guild_id=None, kind=None):
+        self.load()
+        return sorted(
+            (j for j in self.jobs.values() if (guild_id is None or j["guild_id"] == guild_id) and (kind is None or j["kind"] == kind)),
+            key=lambda j: j["due"]
+        )
+
+    def start(self, bot):
+        self.load()
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(bot))
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, bot):
+        await bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                due, job_id = heapq.heappop(self._heap)
+                job = self.jobs.get(job_id)
+                if job is None or job["due"] != due:
+                    continue  # cancelled or rescheduled
+                handler = self._handlers.get(job["kind"])
+                if handler is None:
+                    job["due"] = now + HANDLER_RETRY_DELAY
+                    heapq.heappush(self._heap, (job["due"], job_id))
+                    continue
+                # At most once: drop it before running so a crash mid-post does not repeat it
+                del self.jobs[job_id]
+                self._save()
+                task = asyncio.create_task(self._execute(handler, bot, job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, handler, bot, job):
+        try:
+            await handler(bot, job)
+        except Exception as e:
+            logger.error(f"Scheduled job {job['id']} ({job['kind']}) failed: {e}")
+
+
+scheduler = JobScheduler()
+
+
+class SchedulerCog(commands.Cog):
+    """Runs the shared job scheduler for as long as the bot is up."""
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        scheduler.start(self.bot)
+
+    async def cog_unload(self):
+        scheduler.stop()
+
+async def setup(bot):
+    await bot.add_cog(SchedulerCog(bot))
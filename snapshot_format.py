@@ -0,0 +1,135 @@
+import io
+import csv
+import datetime
+import discord
+
+# Discord limits
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+FIELDS_PER_EMBED = 25
+EMBED_CHAR_LIMIT = 6000
+EMBEDS_PER_MESSAGE = 10
+MESSAGE_CHAR_LIMIT = 6000  # shared by every embed in one message
+
+# Past this many messages the inline list stops and only the attachment has the rest
+MAX_MESSAGES = 5
+# Room kept in each embed's budget for a note appended to the footer by finish()
+FOOTER_NOTE_RESERVE = 80
+
+
+class EmbedPacker:
+    """Packs sections of short items into embed fields, embeds and messages as they stream in.
+
+    Items in a section are joined with `separator` into fields of at most 1024 characters;
+    a section that overflows carries on in a "(cont.)" field. Fields fill embeds (25 fields,
+    6000 characters) and embeds fill messages (10 embeds, 6000 characters between them).
+    Nothing is built up front, so memory stays proportional to the output actually sent.
+    Once `max_messages` messages are full, further items are only counted in `omitted`.
+    """
+    def __init__(self, title, description, footer, color, separator=", ", max_messages=MAX_MESSAGES):
+        self.title = title
+        self.description = description
+        self.footer = footer
+        self.color = color
+        self.separator = separator
+        self.max_messages = max_messages
+        self.messages = []  # [[embed, ...], ...]
+        self.omitted = 0
+        self.full = False
+        self._embed = None
+        self._embed_chars = 0
+        self._message_chars = 0
+        self._section = None
+        self._field_name = None
+        self._field_parts = []
+        self._field_len = 0
+
+    def _open_embed(self, field_cost=0):
+        first = not self.messages
+        title = self.title if first else f"{self.title} (cont.)"
+        description = self.description if first else None
+        cost = len(title) + len(description or "") + len(self.footer) + FOOTER_NOTE_RESERVE
+        message = self.messages[-1] if self.messages else None
+        if message is None or len(message) >= EMBEDS_PER_MESSAGE or self._message_chars + cost + field_cost > MESSAGE_CHAR_LIMIT:
+            if len(self.messages) >= self.max_messages:
+                return False
+            message = []
+            self.messages.append(message)
+            self._message_chars = 0
+        self._embed = discord.Embed(title=title, description=description, color=self.color)
+        self._embed.set_footer(text=self.footer)
+        message.append(self._embed)
+        self._embed_chars = cost
+        self._message_chars += cost
+        return True
+
+    def _add_field(self, name, value):
+        cost = len(name) + len(value)
+        if (self._embed is None or len(self._embed.fields) >= FIELDS_PER_EMBED
+                or self._embed_chars + cost > EMBED_CHAR_LIMIT
+                or self._message_chars + cost > MESSAGE_CHAR_LIMIT):
+            if not self._open_embed(cost):
+                return False
+        self._embed.add_field(name=name, value=value, inline=False)
+        self._embed_chars += cost
+        self._message_chars += cost
+        return True
+
+    def _flush_field(self):
+        if not self._field_parts:
+            return
+        if self.full or not self._add_field(self._field_name, self.separator.join(self._field_parts)):
+            self.full = True
+            self.omitted += len(self._field_parts)
+        self._field_name = f"{self._section} (cont.)"
+        self._field_parts = []
+        self._field_len = 0
+
+    def start_section(self, name):
+        self._flush_field()
+        self._section = name[:FIELD_NAME_LIMIT - len(" (cont.)")]
+        self._field_name = self._section
+
+    def add(self, item):
+        if self.full:
+            self.omitted += 1
+            return
+        item = item[:FIELD_VALUE_LIMIT]
+        extra = len(item) + (len(self.separator) if self._field_parts else 0)
+        if self._field_len + extra > FIELD_VALUE_LIMIT:
+            self._flush_field()
+            if self.full:
+                self.omitted += 1
+                return
+            extra = len(item)
+        self._field_parts.append(item)
+        self._field_len += extra
+
+    def finish(self, omitted_note="more not shown"):
+        """Flush what is pending and return the messages as lists of embeds."""
+        self._flush_field()
+        if not self.messages:
+            self._open_embed()
+        if self.omitted:
+            note = f" • {self.omitted} {omitted_note}"[:FOOTER_NOTE_RESERVE]
+            self._embed.set_footer(text=f"{self.footer}{note}")
+        return self.messages
+
+
+class RosterCSV:
+    """Full snapshot roster written row by row as CSV, for attaching next to the embeds."""
+    HEADER = ("channel_id", "channel_name", "member_id", "display_name", "username", "joined_at")
+
+    def __init__(self):
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+        self._writer.writerow(self.HEADER)
+        self.rows = 0
+
+    def add(self, channel, member, joined_at=None):
+        joined = datetime.datetime.fromtimestamp(joined_at, datetime.timezone.utc).isoformat() if joined_at else ""
+        self._writer.writerow((channel.id, channel.name, member.id, member.display_name, str(member), joined))
+        self.rows += 1
+
+    def to_file(self, filename):
+        return discord.File(io.BytesIO(self._buf.getvalue().encode("utf-8")), filename=filename)
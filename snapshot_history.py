@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+# Stored snapshots live here as <guild_id>.jsonl, one record per line
+SNAPSHOT_DIR = "snapshots"
+# A full copy is written at least this often so reading one back replays few deltas
+KEYFRAME_INTERVAL = 25
+# Oldest snapshots beyond this many per guild are dropped
+MAX_SNAPSHOTS = 1000
+
+
+def _ids(values):
+    return array("Q", sorted(values))
+
+
+def diff_snapshots(before, after):
+    """Compare two {channel_id: member IDs} maps.
+
+    Returns (joined, left, moved): sets of member IDs only in `after` / only in
+    `before`, and a list of (member_id, from_channel_id, to_channel_id).
+    """
+    before_at = {mid: cid for cid, ids in before.items() for mid in ids}
+    after_at = {mid: cid for cid, ids in after.items() for mid in ids}
+    joined = after_at.keys() - before_at.keys()
+    left = before_at.keys() - after_at.keys()
+    moved = [
+        (mid, before_at[mid], after_at[mid])
+        for mid in before_at.keys() & after_at.keys()
+        if before_at[mid] != after_at[mid]
+    ]
+    return joined, left, moved
+
+
+class SnapshotHistory:
+    """Stored VC snapshots per guild, each delta-encoded against the one before it.
+
+    A record is either a keyframe holding the whole {channel_id: member IDs} map, or
+    just the IDs added to ("add") and removed from ("remove") each channel since the
+    previous record. Keyframes are written every KEYFRAME_INTERVAL records, or sooner
+    when the delta would be bigger than the map itself. Member IDs are kept as sorted
+    arrays in memory and appended to disk as one JSON line per snapshot.
+    """
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+        self._records = {}  # guild_id: [record, ...] oldest first
+        self._latest = {}   # guild_id: {channel_id: member ID array} of the newest snapshot
+
+    def path_for(self, guild_id):
+        return os.path.join(self.directory, f"{guild_id}.jsonl")
+
+    @staticmethod
+    def _decode(rec):
+        for key in ("channels", "add", "remove"):
+            if key in rec:
+                rec[key] = {int(cid): _ids(mids) for cid, mids in rec[key].items()}
+        return rec
+
+    @staticmethod
+    def _encode(rec):
+        out = dict(rec)
+        for key in ("channels", "add", "remove"):
+            if key in out:
+                out[key] = {str(cid): mids.tolist() for cid, mids in out[key].items()}
+        return json.dumps(out, separators=(",", ":"))
+
+    def _load(self, guild_id):
+        records = self._records.get(guild_id)
+        if records is not None:
+            return records
+        records = self._records[guild_id] = []
+        path = self.path_for(guild_id)
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    for line in f:
+                        try:
+                            records.append(self._decode(json.loads(line)))
+                        except ValueError:
+                            # Torn write at the tail (e.g. crash mid-append)
+                            logger.error(f"Skipping unreadable snapshot record in {path}")
+            except Exception as e:
+                logger.error(f"Failed to load {path}: {e}")
+        # A history must start with a keyframe to be replayable
+        while records and "channels" not in records[0]:
+            records.pop(0)
+        return records
+
+    def _index(self, records, snapshot_id):
+        if not records:
+            return None
+        idx = snapshot_id - records[0]["id"]
+        if 0 <= idx < len(records) and records[idx]["id"] == snapshot_id:
+            return idx
+        for idx, rec in enumerate(records):
+            if rec["id"] == snapshot_id:
+                return idx
+        return None
+
+    @staticmethod
+    def _replay(records, idx):
+        start = idx
+        while "channels" not in records[start]:
+            start -= 1
+        state = {cid: set(mids) for cid, mids in records[start]["channels"].items()}
+        for rec in records[start + 1:idx + 1]:
+            for cid, mids in rec.get("remove", {}).items():
+                if cid in state:
+                    state[cid].difference_update(mids)
+            for cid, mids in rec.get("add", {}).items():
+                state.setdefault(cid, set()).update(mids)
+        return {cid: _ids(mids) for cid, mids in state.items() if mids}
+
+    def _latest_map(self, guild_id):
+        latest = self._latest.get(guild_id)
+        if latest is None:
+            records = self._load(guild_id)
+            latest = self._latest[guild_id] = self._replay(records, len(records) - 1) if records else {}
+        return latest
+
+    def record(self, guild_id, target, label, requested_by, min_minutes, channels):
+        """Store a snapshot ({channel_id: member IDs}) and return its ID."""
+        records = self._load(guild_id)
+        previous = self._latest_map(guild_id)
+        current = {cid: _ids(mids) for cid, mids in channels.items() if mids}
+        rec = {
+            "id": records[-1]["id"] + 1 if records else 1,
+            "ts": int(time.time()),
+            "target": target,
+            "label": label,
+            "by": requested_by,
+            "min_minutes": min_minutes,
+        }
+        add, remove = {}, {}
+        for cid in previous.keys() | current.keys():
+            before = set(previous.get(cid, ()))
+            after = set(current.get(cid, ()))
+            if after - before:
+                add[cid] = _ids(after - before)
+            if before - after:
+                remove[cid] = _ids(before - after)
+        since_keyframe = 0
+        for old in reversed(records):
+            if "channels" in old:
+                break
+            since_keyframe += 1
+        delta_size = sum(map(len, add.values())) + sum(map(len, remove.values()))
+        full_size = sum(map(len, current.values()))
+        if not records or since_keyframe + 1 >= KEYFRAME_INTERVAL or delta_size >= full_size:
+            rec["channels"] = current
+        else:
+            rec["add"] = add
+            rec["remove"] = remove
+        records.append(rec)
+        self._latest[guild_id] = current
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path_for(guild_id), "a") as f:
+                f.write(self._encode(rec) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to store snapshot {rec['id']} for guild {guild_id}: {e}")
+        if len(records) > MAX_SNAPSHOTS + KEYFRAME_INTERVAL:
+            self._trim(guild_id)
+        return rec["id"]
+
+    def _trim(self, guild_id):
+        records = self._records[guild_id]
+        drop = len(records) - MAX_SNAPSHOTS
+        first = dict(records[drop])
+        if "channels" not in first:
+            first["channels"] = self._replay(records, drop)
+            first.pop("add", None)
+            first.pop("remove", None)
+        records[:drop + 1] = [first]
+        path = self.path_for(guild_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                for rec in records:
+                    f.write(self._encode(rec) + "\n")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to rewrite {path}: {e}")
+
+    def get(self, guild_id, snapshot_id):
+        """(record, {channel_id: member ID array}) for a stored snapshot, or None."""
+        records = self._load(guild_id)
+        idx = self._index(records, snapshot_id)
+        if idx is None:
+            return None
+        return records[idx], self._replay(records, idx)
+
+    def list(self, guild_id):
+        """Stored snapshot records, newest first."""
+        return list(reversed(self._load(guild_id)))
+
+
+snapshot_history = SnapshotHistory()
@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("discord")
+from bot.cogs.channel_picker import ChannelPickerView, PAGE_SIZE, parse_channel_target
+
+
+def fake_guild(voice_channel_count):
+    voice_channels = [SimpleNamespace(id=1000 + i, name=f"vc-{i:02d}") for i in range(voice_channel_count)]
+    return SimpleNamespace(id=1, voice_channels=voice_channels, categories=[])
+
+
+class FakeResponse:
+    async def edit_message(self, **kwargs):
+        pass
+
+    async def send_modal(self, modal):
+        pass
+
+
+class DestinationPicker(ChannelPickerView):
+    """Shaped like the Move Member destination picker: keeps its own state next to the base class's."""
+    def __init__(self, guild):
+        super().__init__(guild, "vc", "Select destination VC...", exclude={"1000"}, timeout=60)
+        self.destination = None
+
+    async def on_pick(self, interaction, values):
+        self.destination = int(values[0])
+
+
+def test_paging_after_subclass_sets_state():
+    async def run():
+        view = DestinationPicker(fake_guild(60))
+        interaction = SimpleNamespace(response=FakeResponse())
+        assert view.page_count == 3
+        await view._next_page(interaction)
+        await view._next_page(interaction)
+        assert view.page == 2
+        assert len(view.picker_select.options) == 59 - 2 * PAGE_SIZE
+        await view._prev_page(interaction)
+        view.query = "vc-1"
+        view.refresh()
+        await view._clear_search(interaction)
+        assert view.page == 0
+        assert view.destination is None
+    asyncio.run(run())
+
+
+def test_parse_channel_target_rejects_free_text():
+    assert parse_channel_target("vc:12") == ("vc", 12)
+    assert parse_channel_target("cat:3") == ("cat", 3)
+    for value in ("vc:abc", "cat:", "text:5", "12"):
+        assert parse_channel_target(value) is None
+
+
+def test_multi_select_page_can_be_cleared():
+    class MultiPicker(ChannelPickerView):
+        async def on_pick(self, interaction, values):
+            self.picked = values
+
+    async def run():
+        view = MultiPicker(fake_guild(30), "vc", "Select VCs...", max_values=25)
+        assert view.picker_select.min_values == 0
+        single = DestinationPicker(fake_guild(30))
+        assert single.picker_select.min_values == 1
+    asyncio.run(run())
+
+
+def test_picker_without_on_pick_cannot_be_created():
+    async def run():
+        with pytest.raises(TypeError):
+            ChannelPickerView(fake_guild(3), "vc", "Select...")
+    asyncio.run(run())
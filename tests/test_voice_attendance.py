@@ -0,0 +1,65 @@
+import random
+import struct
+
+import pytest
+
+pytest.importorskip("discord")
+from bot.cogs import voice_attendance
+from bot.cogs.voice_attendance import (
+    AttendanceRecorder, JOIN, LEAVE, MOVE, RESET, LEGACY_HEADER, LEGACY_MAGIC, COLUMN_TYPES,
+    presence_totals, read_blocks,
+)
+
+GUILD = 1
+DAY = 86400
+
+
+def record_history(recorder, monkeypatch, days=10, seed=7):
+    """Random joins, moves and leaves over `days`, flushed every ten minutes with a restart halfway."""
+    rng = random.Random(seed)
+    clock = [1_700_000_000]
+    monkeypatch.setattr(voice_attendance.time, "time", lambda: clock[0])
+    in_voice = set()
+    recorder.record(GUILD, RESET, ts=clock[0])
+    while clock[0] < 1_700_000_000 + days * DAY:
+        clock[0] += rng.randint(1, 300)
+        member = rng.randint(1, 40)
+        if member in in_voice and rng.random() < 0.5:
+            recorder.record(GUILD, LEAVE, member, 10, 0, ts=clock[0])
+            in_voice.discard(member)
+        else:
+            recorder.record(GUILD, MOVE if member in in_voice else JOIN, member, 0, rng.randint(10, 13), ts=clock[0])
+            in_voice.add(member)
+        if clock[0] % 600 < 300:
+            recorder.flush_now()
+        if clock[0] > 1_700_000_000 + days * DAY // 2 and in_voice and rng.random() < 0.001:
+            # Reconnect: everything still open is closed, then rejoined at the same time
+            recorder.record(GUILD, RESET, ts=clock[0])
+            for m in in_voice:
+                recorder.record(GUILD, JOIN, m, 0, 10, ts=clock[0])
+    recorder.flush_now()
+    return clock[0]
+
+
+def test_windowed_read_matches_full_replay(tmp_path, monkeypatch):
+    recorder = AttendanceRecorder(directory=str(tmp_path), capacity=64)
+    now = record_history(recorder, monkeypatch)
+    path = recorder.path_for(GUILD)
+    all_blocks = sum(1 for _ in read_blocks(path))
+    for minutes in (5, 120, 1440, 10080):
+        start, end = now - minutes * 60, now
+        for channel_ids in (None, {11}):
+            expected = presence_totals(read_blocks(path), start, end, channel_ids)
+            assert presence_totals(read_blocks(path, start, end), start, end, channel_ids) == expected
+    # A two-hour window only decodes blocks from the checkpoint before it onwards
+    assert sum(1 for _ in read_blocks(path, now - 7200, now)) < all_blocks // 10
+
+
+def test_legacy_blocks_are_still_read(tmp_path):
+    path = tmp_path / "1.vatt"
+    rows = [(100, JOIN, 5, 0, 10), (160, LEAVE, 5, 10, 0)]
+    with open(path, "wb") as f:
+        f.write(LEGACY_HEADER.pack(LEGACY_MAGIC, len(rows)))
+        for typecode, col in zip(COLUMN_TYPES, zip(*rows)):
+            f.write(struct.pack(f"<{len(col)}{typecode}", *col))
+    assert presence_totals(read_blocks(str(path), 0, 1000), 0, 1000) == {5: 60}
@@ -0,0 +1,138 @@
+import os
+import json
+import logging
+import discord
+from discord.ext import commands
+from bot.cogs.channel_picker import picker_indexes
+
+logger = logging.getLogger(__name__)
+
+# Persistent per-guild move/disconnect configuration
+VCACCESS_FILE = "vc_access.json"
+ACCESS_KINDS = ("move", "disconnect")
+
+
+class VCAccessConfig:
+    """Per-guild move/disconnect settings with an in-memory read-through cache.
+
+    The file is read once on first access; after that lookups are a dict hit and
+    saves write the whole (small) file back so every guild survives a restart.
+    """
+    def __init__(self, path=VCACCESS_FILE):
+        self.path = path
+        self._data = None  # {str(guild_id): {kind: {...}}} as stored on disk
+        self._cache = {}   # (kind, guild_id): config dict or None
+
+    def _load(self):
+        if self._data is not None:
+            return self._data
+        self._data = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    self._data = json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load {self.path}: {e}")
+        return self._data
+
+    def get(self, guild_id, kind):
+        key = (kind, guild_id)
+        if key in self._cache:
+            return self._cache[key]
+        raw = self._load().get(str(guild_id), {}).get(kind)
+        config = None
+        if raw and raw.get('role_id'):
+            config = {
+                'role_id': raw['role_id'],
+                'channel_ids': frozenset(raw.get('channel_ids', ())),
+                'category_ids': frozenset(raw.get('category_ids', ())),
+            }
+        self._cache[key] = config
+        return config
+
+    def save(self, guild_id, kind, role_id, channel_ids, category_ids):
+        if kind not in ACCESS_KINDS:
+            raise ValueError(f"Unknown access kind: {kind}")
+        self._load().setdefault(str(guild_id), {})[kind] = {
+            'role_id': role_id,
+            'channel_ids': sorted(channel_ids),
+            'category_ids': sorted(category_ids),
+        }
+        self._cache.pop((kind, guild_id), None)
+        allowed_vcs.invalidate(guild_id, kind)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._data, f)
+        os.replace(tmp_path, self.path)
+
+
+def compile_allowed_vcs(guild, config):
+    """Flatten a move/disconnect config into the set of voice channel IDs it covers in `guild`."""
+    allowed = set(config['channel_ids'])
+    for cat_id in config['category_ids']:
+        cat = guild.get_channel(cat_id)
+        if isinstance(cat, discord.CategoryChannel):
+            allowed.update(ch.id for ch in cat.channels)
+    return frozenset(allowed)
+
+
+class AllowedVCIndex:
+    """Per-guild frozensets of allowed VC IDs, compiled lazily from the saved config.
+
+    Entries are keyed by (kind, guild_id) where kind is "move" or "disconnect", and are
+    dropped whenever the config is saved or the guild's channel layout changes, so the
+    next authorization check recompiles once and every check after that is a set lookup.
+    """
+    def __init__(self):
+        self._compiled = {}  # (kind, guild_id): frozenset of channel IDs
+
+    def get(self, guild, kind):
+        key = (kind, guild.id)
+        allowed = self._compiled.get(key)
+        if allowed is None:
+            config = vc_access_config.get(guild.id, kind)
+            allowed = compile_allowed_vcs(guild, config) if config else frozenset()
+            self._compiled[key] = allowed
+        return allowed
+
+    def is_allowed(self, guild, kind, channel_id):
+        return channel_id in self.get(guild, kind)
+
+    def invalidate(self, guild_id=None, kind=None):
+        if guild_id is None and kind is None:
+            self._compiled.clear()
+            return
+        for key in [k for k in self._compiled if (kind is None or k[0] == kind) and (guild_id is None or k[1] == guild_id)]:
+            del self._compiled[key]
+
+
+allowed_vcs = AllowedVCIndex()
+vc_access_config = VCAccessConfig()
+
+
+class VCAccessCog(commands.Cog):
+    """Keeps channel-derived caches (allowed-VC sets, picker indexes) in step with the guild's channel layout."""
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        allowed_vcs.invalidate(channel.guild.id)
+        picker_indexes.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        allowed_vcs.invalidate(channel.guild.id)
+        picker_indexes.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        # Only a change of parent category can move a channel in or out of an allowed set
+        category_changed = getattr(before, 'category_id', None) != getattr(after, 'category_id', None)
+        if category_changed:
+            allowed_vcs.invalidate(after.guild.id)
+        if category_changed or before.name != after.name:
+            picker_indexes.invalidate(after.guild.id)
+
+async def setup(bot):
+    await bot.add_cog(VCAccessCog(bot))
@@ -1,22 +1,194 @@
+import os
+import json
+import asyncio
+import logging
 import discord
 from discord.ext import commands
 from discord import app_commands
+from bot.cogs.bulk_ops import run_bulk
+
+logger = logging.getLogger(__name__)
+
+# Lockable VCs and active locks survive restarts here
+VCLOCK_FILE = "vc_locks.json"
+# Seconds a locked member may be gone before the VC unlocks (overridable per VC in /vc_lock_setup)
+DEFAULT_GRACE_SECONDS = 30
+
+def _copy_overwrite(overwrite):
+    return discord.PermissionOverwrite.from_pair(*overwrite.pair())
+
+def _target_key(target):
+    """Stable, JSON-friendly key for an overwrite target: "role:<id>" or "member:<id>"."""
+    kind = "member" if isinstance(target, (discord.Member, discord.User)) else "role"
+    return f"{kind}:{target.id}"
+
+def _resolve_target(guild, key, current):
+    kind, _, target_id = key.partition(":")
+    target_id = int(target_id)
+    target = guild.get_member(target_id) if kind == "member" else guild.get_role(target_id)
+    if target is None:
+        target = next((t for t in current if _target_key(t) == key), None)
+    if target is None:
+        target = discord.Object(id=target_id, type=discord.Member if kind == "member" else discord.Role)
+    return target
+
+def lock_overwrites(channel, keep_members):
+    """Overwrites that lock `channel` to `keep_members`, plus the previous value of every target touched.
+
+    @everyone is denied Connect, as is any role whose overwrite explicitly allows it (that
+    allow would beat the @everyone deny). Members being kept get an explicit allow so they
+    can still reconnect. Targets that already have the wanted Connect value are left alone.
+    Returns (new_overwrites, previous) where previous maps each touched target's key to its
+    old [allow, deny] permission values, or None if it had no overwrite.
+    """
+    current = channel.overwrites
+    everyone = channel.guild.default_role
+    wanted = {everyone: False}
+    for target, overwrite in current.items():
+        if isinstance(target, discord.Role) and target != everyone and overwrite.connect is True:
+            wanted[target] = False
+    for member in keep_members:
+        wanted[member] = True
+    new = dict(current)
+    previous = {}
+    for target, connect in wanted.items():
+        old = current.get(target)
+        if old is not None and old.connect is connect:
+            continue
+        overwrite = _copy_overwrite(old) if old is not None else discord.PermissionOverwrite()
+        overwrite.connect = connect
+        new[target] = overwrite
+        previous[_target_key(target)] = [p.value for p in old.pair()] if old is not None else None
+    return new, previous
+
+def unlock_overwrites(channel, previous):
+    """Current overwrites with every target touched by the lock put back exactly as it was."""
+    current = channel.overwrites
+    new = {target: overwrite for target, overwrite in current.items() if _target_key(target) not in previous}
+    for key, values in previous.items():
+        if values is not None:
+            allow, deny = values
+            new[_resolve_target(channel.guild, key, current)] = discord.PermissionOverwrite.from_pair(
+                discord.Permissions(allow), discord.Permissions(deny)
+            )
+    return new
 
 class VCTrapdoorLock(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.vc_config = {}  # {channel_id: role_id}
-        self.vc_locked_members = {}  # {channel_id: [member_ids]}
+        self.vc_config = {}  # {channel_id: {"role_id": int, "grace": seconds}}
+        self.vc_locked_members = {}  # {channel_id: {member_ids}} for locked channels
+        self.member_locks = {}  # {member_id: {locked channel_ids}}, so unrelated voice events exit on one lookup
+        self.vc_previous_overwrites = {}  # {channel_id: {target key: [allow, deny] or None}} to restore on unlock
+        self.pending_unlocks = {}  # {channel_id: (TimerHandle, {departed member_ids})}
+        self.reconcile_task = None
+        self.unlock_tasks = set()  # grace-expiry unlocks in flight; the loop only holds weak references to tasks
+        self.load_state()
+
+    def load_state(self):
+        if not os.path.exists(VCLOCK_FILE):
+            return
+        try:
+            with open(VCLOCK_FILE, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load {VCLOCK_FILE}: {e}")
+            return
+        self.vc_config = {int(cid): config for cid, config in data.get("config", {}).items()}
+        for cid, lock in data.get("locks", {}).items():
+            self._track(int(cid), set(lock["members"]))
+            self.vc_previous_overwrites[int(cid)] = lock["previous"]
+
+    def save_state(self):
+        data = {
+            "config": {str(cid): config for cid, config in self.vc_config.items()},
+            "locks": {
+                str(cid): {"members": sorted(members), "previous": self.vc_previous_overwrites.get(cid, {})}
+                for cid, members in self.vc_locked_members.items()
+            },
+        }
+        tmp_path = f"{VCLOCK_FILE}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, VCLOCK_FILE)
+        except Exception as e:
+            logger.error(f"Failed to save {VCLOCK_FILE}: {e}")
+
+    async def cog_load(self):
+        if self.bot.is_ready():
+            self.reconcile_task = asyncio.create_task(self.reconcile())
+
+    async def cog_unload(self):
+        if self.reconcile_task:
+            self.reconcile_task.cancel()
+        # Locks stay on record, so the next reconcile releases any whose members did not return
+        for handle, _ in self.pending_unlocks.values():
+            handle.cancel()
+        for task in list(self.unlock_tasks):
+            task.cancel()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self.reconcile()
+
+    async def reconcile(self):
+        """Bring stored locks in line with the channels as they are now.
+
+        Locks whose channel is gone are dropped. A lock where any locked member has left
+        (e.g. while the bot was offline) is released. Otherwise the lock overwrites are
+        recomputed and, only if something drifted, re-applied with one edit per channel.
+        Edits for all channels run concurrently.
+        """
+        unlocks, relocks = [], []
+        for channel_id in list(self.vc_locked_members):
+            if channel_id in self.pending_unlocks:
+                continue
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                self._untrack(channel_id)
+                self.vc_previous_overwrites.pop(channel_id, None)
+                continue
+            present = {m.id for m in channel.members}
+            if not self.vc_locked_members[channel_id] <= present:
+                unlocks.append(channel)
+                continue
+            overwrites, drift = lock_overwrites(channel, [m for m in channel.members if m.id in self.vc_locked_members[channel_id]])
+            if drift:
+                # Keep the oldest value of each target so unlock still restores the pre-lock state
+                previous = self.vc_previous_overwrites.setdefault(channel_id, {})
+                for key, values in drift.items():
+                    previous.setdefault(key, values)
+                relocks.append((channel, overwrites))
+        self.save_state()
+        unlocked = await run_bulk(unlocks, self.unlock_vc)
+        relocked = await run_bulk(relocks, lambda item: item[0].edit(overwrites=item[1], reason="VC lock restored"))
+        if unlocks or relocks:
+            logger.info(
+                f"VC lock reconciliation: {len(unlocked.done)} unlocked, {len(relocked.done)} re-locked, "
+                f"{len(unlocked.failed) + len(relocked.failed)} failed"
+            )
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        if channel.id in self.vc_config or channel.id in self.vc_locked_members:
+            self.vc_config.pop(channel.id, None)
+            self._untrack(channel.id)
+            self.vc_previous_overwrites.pop(channel.id, None)
+            self.save_state()
 
     # Setup command for mods to register lockable VCs
     @app_commands.command(name="vc_lock_setup", description="Set up a VC and lock role")
+    @app_commands.describe(grace_seconds="How long a locked member may be gone (e.g. reconnecting) before the VC unlocks")
     @app_commands.checks.has_permissions(manage_channels=True)
     async def vc_lock_setup(self, interaction: discord.Interaction,
                             channel: discord.VoiceChannel,
-                            role: discord.Role):
-        self.vc_config[channel.id] = role.id
+                            role: discord.Role,
+                            grace_seconds: app_commands.Range[int, 0, 600] = DEFAULT_GRACE_SECONDS):
+        self.vc_config[channel.id] = {"role_id": role.id, "grace": grace_seconds}
+        self.save_state()
         await interaction.response.send_message(
-            f"✅ {channel.name} is now lockable by role {role.name}.", ephemeral=True
+            f"✅ {channel.name} is now lockable by role {role.name} (unlocks {grace_seconds}s after a locked member leaves).", ephemeral=True
         )
 
     # Command to lock a VC
@@ -29,41 +201,108 @@ class VCTrapdoorLock(commands.Cog):
         if not channel:
             return await interaction.response.send_message("You're not in a VC and no channel was selected.", ephemeral=True)
 
-        role_id = self.vc_config.get(channel.id)
-        if not role_id:
+        config = self.vc_config.get(channel.id)
+        if not config:
             return await interaction.response.send_message("This VC is not configured for locking.", ephemeral=True)
 
-        lock_role = interaction.guild.get_role(role_id)
+        lock_role = interaction.guild.get_role(config["role_id"])
         if lock_role not in user.roles:
             return await interaction.response.send_message("You don’t have permission to lock this VC.", ephemeral=True)
 
-        # Lock the VC for everyone
-        self.vc_locked_members[channel.id] = [m.id for m in channel.members]
+        if channel.id in self.vc_locked_members:
+            return await interaction.response.send_message(f"`{channel.name}` is already locked.", ephemeral=True)
 
-        for role in channel.guild.roles:
-            overwrite = channel.overwrites_for(role)
-            overwrite.connect = False
-            await channel.set_permissions(role, overwrite=overwrite)
+        # Lock the VC for everyone but the members inside, in a single request
+        members = list(channel.members)
+        overwrites, previous = lock_overwrites(channel, members)
+        if previous:
+            try:
+                await channel.edit(overwrites=overwrites, reason=f"VC locked by {user}")
+            except discord.HTTPException as e:
+                return await interaction.response.send_message(f"❌ Failed to lock `{channel.name}`: {e}", ephemeral=True)
+        self._track(channel.id, {m.id for m in members})
+        self.vc_previous_overwrites[channel.id] = previous
+        self.save_state()
 
         await interaction.response.send_message(f"🔒 `{channel.name}` is now locked.")
 
-    # Listener to auto-unlock when someone leaves
+    def _track(self, channel_id, member_ids):
+        self.vc_locked_members[channel_id] = member_ids
+        for member_id in member_ids:
+            self.member_locks.setdefault(member_id, set()).add(channel_id)
+
+    def _untrack(self, channel_id):
+        pending = self.pending_unlocks.pop(channel_id, None)
+        if pending:
+            pending[0].cancel()
+        for member_id in self.vc_locked_members.pop(channel_id, ()):
+            locks = self.member_locks.get(member_id)
+            if locks is not None:
+                locks.discard(channel_id)
+                if not locks:
+                    del self.member_locks[member_id]
+
+    # Listener to auto-unlock when someone from the locked group leaves and does not come back
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
-        if before.channel and before.channel.id in self.vc_locked_members:
-            prev_members = self.vc_locked_members[before.channel.id]
-            if member.id in prev_members:
-                # Someone from the locked group left
-                await self.unlock_vc(before.channel)
+        if before.channel == after.channel:
+            return
+        locks = self.member_locks.get(member.id)
+        if not locks:
+            return
+        if after.channel and after.channel.id in locks:
+            self._member_returned(after.channel.id, member.id)
+        if before.channel and before.channel.id in locks:
+            self._member_departed(before.channel, member.id)
+
+    def _member_departed(self, channel, member_id):
+        pending = self.pending_unlocks.get(channel.id)
+        if pending:
+            pending[1].add(member_id)
+            return
+        config = self.vc_config.get(channel.id) or {}
+        grace = config.get("grace", DEFAULT_GRACE_SECONDS)
+        handle = asyncio.get_running_loop().call_later(grace, self._start_grace_expiry, channel.id)
+        self.pending_unlocks[channel.id] = (handle, {member_id})
+
+    def _start_grace_expiry(self, channel_id):
+        task = asyncio.create_task(self._grace_expired(channel_id))
+        self.unlock_tasks.add(task)
+        task.add_done_callback(self.unlock_tasks.discard)
+
+    def _member_returned(self, channel_id, member_id):
+        pending = self.pending_unlocks.get(channel_id)
+        if not pending:
+            return
+        pending[1].discard(member_id)
+        if not pending[1]:
+            # Everyone who left came back in time: stay locked
+            pending[0].cancel()
+            del self.pending_unlocks[channel_id]
+
+    async def _grace_expired(self, channel_id):
+        if self.pending_unlocks.pop(channel_id, None) is None:
+            return
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            self._untrack(channel_id)
+            self.vc_previous_overwrites.pop(channel_id, None)
+            self.save_state()
+            return
+        try:
+            await self.unlock_vc(channel)
+        except Exception as e:
+            logger.error(f"Failed to unlock {channel.name}: {e}")
 
     # Unlock helper
     async def unlock_vc(self, channel):
-        for role in channel.guild.roles:
-            overwrite = channel.overwrites_for(role)
-            overwrite.connect = True
-            await channel.set_permissions(role, overwrite=overwrite)
-
-        self.vc_locked_members.pop(channel.id, None)
+        previous = self.vc_previous_overwrites.get(channel.id)
+        if previous:
+            # If this fails the lock stays on record, so the next reconcile retries it
+            await channel.edit(overwrites=unlock_overwrites(channel, previous), reason="VC unlocked")
+        self._untrack(channel.id)
+        self.vc_previous_overwrites.pop(channel.id, None)
+        self.save_state()
 
         # Optional: Notify a log channel or system channel
         if channel.guild.system_channel:
@@ -1,9 +1,16 @@
 import discord
-import asyncio
 import datetime
 import logging
 from discord import app_commands
 from discord.ext import commands
+from bot.cogs.vc_access import allowed_vcs, vc_access_config
+from bot.cogs.channel_picker import ChannelPickerView, channel_autocomplete, parse_channel_target
+from bot.cogs.voice_presence import voice_presence
+from bot.cogs.scheduler import scheduler
+from bot.cogs.snapshot_format import EmbedPacker, RosterCSV
+from bot.cogs.snapshot_history import snapshot_history, diff_snapshots
+from bot.cogs.bulk_ops import set_user_limits
+from bot.cogs.prefix_router import prefix_router
 
 
 # Compatibility for discord.py versions with/without TextInputStyle
@@ -17,17 +24,22 @@ except ImportError:
         paragraph = 2
 
 
+# Snapshots with at least this many users always come with the CSV roster attached
+SNAPSHOT_CSV_MIN_USERS = 50
+
 
 class VoiceCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
-        # In-memory config for move permissions
-        self.move_config = {
-            'role_id': None,
-            'channel_ids': set(),
-            'category_ids': set(),
-        }
+
+    async def cog_load(self):
+        scheduler.register("vc_snapshot", run_snapshot_job)
+        prefix_router.register("disconnect", self.prefix_disconnect)
+
+    async def cog_unload(self):
+        scheduler.unregister("vc_snapshot")
+        prefix_router.unregister("disconnect")
 
     def is_mod(self, interaction):
         # Import here to avoid circular import
@@ -35,8 +47,132 @@ class VoiceCog(commands.Cog):
         return global_is_mod(interaction)
 
     @app_commands.command(name="vc_snapshot", description="Take a snapshot of users in a voice channel or all VCs in a category, now or after a timer.")
-    async def vc_snapshot(self, interaction: discord.Interaction):
-        await vc_snapshot_command(interaction)
+    @app_commands.describe(target="Voice channel or category to snapshot (type to search, or leave blank to browse)")
+    @app_commands.autocomplete(target=channel_autocomplete("voice"))
+    async def vc_snapshot(self, interaction: discord.Interaction, target: str = None):
+        await vc_snapshot_command(interaction, target)
+
+    @app_commands.command(name="vc_snapshot_jobs", description="List scheduled VC snapshots in this server.")
+    async def vc_snapshot_jobs(self, interaction: discord.Interaction):
+        if not self.is_mod(interaction):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+        jobs = scheduler.pending(interaction.guild_id, "vc_snapshot")
+        if not jobs:
+            await interaction.response.send_message("No scheduled snapshots.", ephemeral=True)
+            return
+        lines = []
+        for job in jobs[:25]:
+            channels, target_desc = resolve_snapshot_target(interaction.guild, job["payload"]["target"])
+            lines.append(f"**#{job['id']}** — {target_desc if channels else 'missing target'} <t:{int(job['due'])}:R> (by {job['payload']['requested_by_name']})")
+        if len(jobs) > 25:
+            lines.append(f"... and {len(jobs) - 25} more")
+        embed = discord.Embed(title="⏳ Scheduled VC Snapshots", description="\n".join(lines), color=discord.Color.blue())
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    async def snapshot_job_autocomplete(self, interaction: discord.Interaction, current: str):
+        # Choice names are plain text, so Discord timestamp markup would show up raw
+        now = datetime.datetime.now(datetime.timezone.utc)
+        choices = []
+        for job in scheduler.pending(interaction.guild_id, "vc_snapshot"):
+            if not str(job["id"]).startswith(current.lstrip("#")):
+                continue
+            due = datetime.datetime.fromtimestamp(job["due"], datetime.timezone.utc)
+            minutes = max(0, int((due - now).total_seconds() // 60))
+            when = f"{due:%b %d %H:%M} UTC (in {minutes // 60}h {minutes % 60}m)" if minutes >= 60 else f"{due:%H:%M} UTC (in {minutes}m)"
+            choices.append(app_commands.Choice(name=f"#{job['id']} due {when} by {job['payload']['requested_by_name']}"[:100], value=job["id"]))
+        return choices[:25]
+
+    @app_commands.command(name="vc_snapshot_cancel", description="Cancel a scheduled VC snapshot.")
+    @app_commands.describe(job_id="Snapshot number shown when it was scheduled")
+    @app_commands.autocomplete(job_id=snapshot_job_autocomplete)
+    async def vc_snapshot_cancel(self, interaction: discord.Interaction, job_id: int):
+        if not self.is_mod(interaction):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+        job = scheduler.cancel(job_id, interaction.guild_id, kind="vc_snapshot")
+        if not job:
+            await interaction.response.send_message(f"❌ No scheduled snapshot #{job_id}.", ephemeral=True)
+            return
+        await interaction.response.send_message(f"✅ Snapshot #{job_id} cancelled.", ephemeral=True)
+
+    async def stored_snapshot_autocomplete(self, interaction: discord.Interaction, current: str):
+        query = current.lstrip("#").lower()
+        choices = []
+        for rec in snapshot_history.list(interaction.guild_id):
+            when = datetime.datetime.fromtimestamp(rec["ts"], datetime.timezone.utc).strftime("%b %d %H:%M UTC")
+            name = f"#{rec['id']} · {rec['label']} · {when}"
+            if query in name.lower():
+                choices.append(app_commands.Choice(name=name[:100], value=rec["id"]))
+                if len(choices) == 25:
+                    break
+        return choices
+
+    @app_commands.command(name="vc_snapshot_diff", description="Show who joined, left or moved between two VC snapshots (or since a snapshot).")
+    @app_commands.describe(before="Earlier snapshot", after="Later snapshot (leave blank to compare with now)")
+    @app_commands.autocomplete(before=stored_snapshot_autocomplete, after=stored_snapshot_autocomplete)
+    async def vc_snapshot_diff(self, interaction: discord.Interaction, before: int, after: int = None):
+        if not self.is_mod(interaction):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+        guild = interaction.guild
+        first = snapshot_history.get(guild.id, before)
+        if first is None:
+            await interaction.response.send_message(f"❌ No stored snapshot #{before}.", ephemeral=True)
+            return
+        first_rec, before_map = first
+        if after is not None:
+            second = snapshot_history.get(guild.id, after)
+            if second is None:
+                await interaction.response.send_message(f"❌ No stored snapshot #{after}.", ephemeral=True)
+                return
+            second_rec, after_map = second
+            after_desc = f"**#{after}** {second_rec['label']} (<t:{second_rec['ts']}:f>)"
+        else:
+            # Compare against the same target as it looks right now
+            channels, target_desc = resolve_snapshot_target(guild, first_rec["target"])
+            if channels is None:
+                await interaction.response.send_message(target_desc, ephemeral=True)
+                return
+            min_seconds = first_rec.get("min_minutes", 0) * 60
+            after_map = {vc.id: [m.id for m in snapshot_members(vc, min_seconds)] for vc in channels}
+            after_desc = "**now**"
+        joined, left, moved = diff_snapshots(before_map, after_map)
+
+        def member_name(member_id):
+            member = guild.get_member(member_id)
+            return discord.utils.escape_markdown(member.display_name) if member else f"<@{member_id}>"
+
+        def channel_name(channel_id):
+            channel = guild.get_channel(channel_id)
+            return channel.name if channel else f"#{channel_id}"
+
+        packer = EmbedPacker(
+            title="🔀 VC Snapshot Diff",
+            description=f"**#{before}** {first_rec['label']} (<t:{first_rec['ts']}:f>)\n→ {after_desc}\n\n"
+                        f"Joined: **{len(joined)}** · Left: **{len(left)}** · Moved: **{len(moved)}**",
+            footer=f"Requested by {interaction.user.display_name}",
+            color=discord.Color.blue()
+        )
+        if joined:
+            packer.start_section(f"➕ Joined ({len(joined)})")
+            for member_id in sorted(joined):
+                packer.add(member_name(member_id))
+        if left:
+            packer.start_section(f"➖ Left ({len(left)})")
+            for member_id in sorted(left):
+                packer.add(member_name(member_id))
+        if moved:
+            packer.start_section(f"🔀 Moved ({len(moved)})")
+            for member_id, from_id, to_id in sorted(moved, key=lambda m: (m[2], m[0])):
+                packer.add(f"{member_name(member_id)}: {channel_name(from_id)} → {channel_name(to_id)}")
+        if not (joined or left or moved):
+            packer.start_section("No changes")
+            packer.add("Everyone is where they were.")
+        messages = packer.finish()
+        await interaction.response.send_message(embeds=messages[0], ephemeral=True)
+        for embeds in messages[1:]:
+            await interaction.followup.send(embeds=embeds, ephemeral=True)
 
     @app_commands.command(name="vc_disconnect_setup", description="Set up which VCs/categories and role can disconnect members.")
     async def vc_disconnect_setup(self, interaction: discord.Interaction):
@@ -52,10 +188,11 @@ class VoiceCog(commands.Cog):
 
     @app_commands.context_menu(name="Disconnect Member")
     async def disconnect_member_context(self, interaction: discord.Interaction, target: discord.Member):
-        if not self.move_config['role_id']:
+        config = vc_access_config.get(interaction.guild_id, "disconnect")
+        if not config:
             await interaction.response.send_message("Disconnect setup not configured.", ephemeral=True)
             return
-        if self.move_config['role_id'] not in [role.id for role in interaction.user.roles]:
+        if interaction.user.get_role(config['role_id']) is None:
             await interaction.response.send_message("You do not have the disconnect role.", ephemeral=True)
             return
         if not interaction.user.voice or not target.voice:
@@ -63,13 +200,7 @@ class VoiceCog(commands.Cog):
             return
         user_vc = interaction.user.voice.channel
         target_vc = target.voice.channel
-        allowed = False
-        if user_vc.id in self.move_config['channel_ids'] and user_vc.id == target_vc.id:
-            allowed = True
-        for cat_id in self.move_config['category_ids']:
-            cat = interaction.guild.get_channel(cat_id)
-            if cat and user_vc in cat.channels and user_vc == target_vc:
-                allowed = True
+        allowed = user_vc.id == target_vc.id and allowed_vcs.is_allowed(interaction.guild, "disconnect", user_vc.id)
         if not allowed:
             await interaction.response.send_message("You can only disconnect members in the same allowed VC.", ephemeral=True)
             return
@@ -79,46 +210,178 @@ class VoiceCog(commands.Cog):
         except Exception as e:
             await interaction.response.send_message(f"❌ Failed to disconnect: {e}", ephemeral=True)
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot:
+    async def prefix_disconnect(self, message, args):
+        """!disconnect @member, routed here by prefix_router."""
+        config = vc_access_config.get(message.guild.id, "disconnect")
+        if not config:
+            await message.channel.send("Disconnect setup not configured.")
             return
-        if message.content.startswith('!disconnect'):
-            if not self.move_config['role_id']:
-                await message.channel.send("Disconnect setup not configured.")
-                return
-            if self.move_config['role_id'] not in [role.id for role in message.author.roles]:
-                await message.channel.send("You do not have the disconnect role.")
-                return
-            if not message.author.voice or not message.mentions:
-                await message.channel.send("You and the mentioned user must both be in a voice channel.")
-                return
-            target = message.mentions[0]
-            if not target.voice:
-                await message.channel.send("The mentioned user is not in a voice channel.")
-                return
-            user_vc = message.author.voice.channel
-            target_vc = target.voice.channel
-            allowed = False
-            if user_vc.id in self.move_config['channel_ids'] and user_vc.id == target_vc.id:
-                allowed = True
-            for cat_id in self.move_config['category_ids']:
-                cat = message.guild.get_channel(cat_id)
-                if cat and user_vc in cat.channels and user_vc == target_vc:
-                    allowed = True
-            if not allowed:
-                await message.channel.send("You can only disconnect members in the same allowed VC.")
-                return
-            try:
-                await target.edit(voice_channel=None)
-                await message.channel.send(f"✅ {target.display_name} has been disconnected from the voice channel.")
-            except Exception as e:
-                await message.channel.send(f"❌ Failed to disconnect: {e}")
+        if message.author.get_role(config['role_id']) is None:
+            await message.channel.send("You do not have the disconnect role.")
+            return
+        if not message.author.voice or not message.mentions:
+            await message.channel.send("You and the mentioned user must both be in a voice channel.")
+            return
+        target = message.mentions[0]
+        if not target.voice:
+            await message.channel.send("The mentioned user is not in a voice channel.")
+            return
+        user_vc = message.author.voice.channel
+        target_vc = target.voice.channel
+        allowed = user_vc.id == target_vc.id and allowed_vcs.is_allowed(message.guild, "disconnect", user_vc.id)
+        if not allowed:
+            await message.channel.send("You can only disconnect members in the same allowed VC.")
+            return
+        try:
+            await target.edit(voice_channel=None)
+            await message.channel.send(f"✅ {target.display_name} has been disconnected from the voice channel.")
+        except Exception as e:
+            await message.channel.send(f"❌ Failed to disconnect: {e}")
 
 logger = logging.getLogger(__name__)
 
+def snapshot_members(vc, min_seconds=0):
+    """Non-bot members of `vc`, oldest join first, read from the presence index when it covers the guild.
+
+    Without the index there are no join times, so `min_seconds` cannot be applied.
+    """
+    if not voice_presence.is_tracking(vc.guild.id):
+        return [m for m in vc.members if not m.bot]
+    present = voice_presence.members(vc.id)
+    if min_seconds > 0:
+        member_ids = voice_presence.present_since([vc.id], min_seconds)[vc.id]
+    else:
+        member_ids = list(present)
+    member_ids.sort(key=present.__getitem__)
+    get_member = vc.guild.get_member
+    return [m for m in map(get_member, member_ids) if m is not None]
+
+def resolve_snapshot_target(guild, target):
+    """Voice channels and a description for a "vc:<id>" / "cat:<id>" target, or (None, error message)."""
+    parsed = parse_channel_target(target)
+    if parsed is None:
+        return None, "❌ Invalid selection."
+    kind, channel_id = parsed
+    if kind == "vc":
+        channel = guild.get_channel(channel_id)
+        if not isinstance(channel, discord.VoiceChannel):
+            return None, "❌ Voice channel not found."
+        return [channel], f"Voice Channel: **{channel.name}**"
+    category = guild.get_channel(channel_id)
+    if not isinstance(category, discord.CategoryChannel):
+        return None, "❌ Category not found."
+    channels = [ch for ch in category.channels if isinstance(ch, discord.VoiceChannel)]
+    if not channels:
+        return None, f"❌ No voice channels found in category '{category.name}'. You must add a voice channel to this category first."
+    return channels, f"Category: **{category.name}** ({len(channels)} voice channels)"
+
+def build_snapshot_messages(rosters, target_desc, timer, min_minutes, requested_by, snapshot_id):
+    """Snapshot as a list of messages (each a list of embeds) plus a CSV of the full roster when it is large.
+
+    Members are streamed channel by channel into the embed packer and the CSV, so even
+    big categories never build one giant string; nothing is cut off silently.
+    """
+    now = datetime.datetime.now()
+    total_users = sum(len(members) for _, members in rosters)
+    packer = EmbedPacker(
+        title="🔎 VC Snapshot",
+        description=f"{target_desc}\nTimer: {timer} seconds\nTime: <t:{int(now.timestamp())}:f>"
+                    + (f"\nPresent for at least {min_minutes} minutes" if min_minutes > 0 else "")
+                    + f"\n**Users Present:** {total_users}\nSnapshot #{snapshot_id} (compare with `/vc_snapshot_diff`)",
+        footer=f"Requested by {requested_by}",
+        color=discord.Color.blue()
+    )
+    roster = RosterCSV()
+    empty = []
+    for vc, members in rosters:
+        if not members:
+            empty.append(vc.name)
+            continue
+        joined = voice_presence.members(vc.id)
+        packer.start_section(f"🔊 {vc.name} ({len(members)})")
+        for m in members:
+            packer.add(discord.utils.escape_markdown(m.display_name))
+            roster.add(vc, m, joined.get(m.id))
+    if empty:
+        packer.start_section(f"Empty ({len(empty)})")
+        for name in empty:
+            packer.add(discord.utils.escape_markdown(name))
+    if total_users == 0:
+        packer.start_section("Users Present (0 total)")
+        packer.add("No users found.")
+    messages = packer.finish("more not shown, see the attached CSV")
+    roster_file = None
+    if packer.omitted or len(messages) > 1 or total_users >= SNAPSHOT_CSV_MIN_USERS:
+        roster_file = roster.to_file(f"vc_snapshot_{now.strftime('%Y%m%d_%H%M%S')}.csv")
+    return messages, roster_file
+
+async def send_snapshot(destination, target, channels, target_desc, timer, min_minutes, requested_by):
+    rosters = [(vc, snapshot_members(vc, min_minutes * 60)) for vc in channels]
+    snapshot_id = snapshot_history.record(
+        channels[0].guild.id, target, target_desc.replace("**", ""), requested_by, min_minutes,
+        {vc.id: [m.id for m in members] for vc, members in rosters}
+    )
+    messages, roster_file = build_snapshot_messages(rosters, target_desc, timer, min_minutes, requested_by, snapshot_id)
+    for i, embeds in enumerate(messages):
+        if i < len(messages) - 1:
+            await destination.send(embeds=embeds)
+        elif roster_file:
+            await destination.send(embeds=embeds, file=roster_file, view=VCSnapshotView(channels))
+        else:
+            await destination.send(embeds=embeds, view=VCSnapshotView(channels))
+
+async def run_snapshot_job(bot, job):
+    """Scheduler handler for "vc_snapshot" jobs submitted by the timer modal."""
+    payload = job["payload"]
+    guild = bot.get_guild(job["guild_id"])
+    if guild is None:
+        return
+    destination = guild.get_channel(payload["post_channel_id"]) if payload.get("post_channel_id") else None
+    if destination is None:
+        destination = bot.get_user(payload["requested_by"]) or await bot.fetch_user(payload["requested_by"])
+    channels, target_desc = resolve_snapshot_target(guild, payload["target"])
+    if channels is None:
+        await destination.send(f"{target_desc} (scheduled snapshot #{job['id']})")
+        return
+    await send_snapshot(destination, payload["target"], channels, target_desc, payload["timer"], payload.get("min_minutes", 0), payload["requested_by_name"])
+
+class VCSnapshotView(discord.ui.View):
+    def __init__(self, voice_channels):
+        super().__init__(timeout=300)
+        self.voice_channels = voice_channels
+
+    @discord.ui.button(label="Set User Limit for All", style=discord.ButtonStyle.primary)
+    async def set_limit(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(SetLimitModal(self.voice_channels))
+
+class SetLimitModal(discord.ui.Modal, title="Set User Limit for All VCs"):
+    def __init__(self, voice_channels):
+        super().__init__()
+        self.voice_channels = voice_channels
+        self.limit = TextInput(
+            label="User limit (0 = unlimited)",
+            style=TextInputStyle.short,
+            required=True,
+            placeholder="0"
+        )
+        self.add_item(self.limit)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            limit = int(self.limit.value)
+        except ValueError:
+            await interaction.response.send_message("❌ User limit must be a number.", ephemeral=True)
+            return
+        if not 0 <= limit <= 99:
+            await interaction.response.send_message("❌ User limit must be between 0 and 99.", ephemeral=True)
+            return
+        # Large categories take longer than the 3 second response window
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        result = await set_user_limits(self.voice_channels, limit)
+        await interaction.followup.send(result.summary(f"Set user limit to {limit} for"), ephemeral=True)
+
 # --- VC SNAPSHOT WITH INTERACTION MENU, TIMER FEEDBACK, AND PUBLIC SNAPSHOT ---
-async def vc_snapshot_command(interaction: discord.Interaction):
+async def vc_snapshot_command(interaction: discord.Interaction, target: str = None):
     logger.info("/vc_snapshot command invoked by %s (%s)", interaction.user, interaction.user.id)
     try:
         # Use the VoiceCog.is_mod method if available
@@ -135,11 +398,11 @@ async def vc_snapshot_command(interaction: discord.Interaction):
                 return
 
         class VCSnapshotTimerAndLimitModal(discord.ui.Modal, title="VC Snapshot: Timer & User Limit"):
-            def __init__(self, channel, category, voice_channels):
+            def __init__(self, target, voice_channels, target_desc):
                 super().__init__()
-                self.channel = channel
-                self.category = category
+                self.target = target
                 self.voice_channels = voice_channels
+                self.target_desc = target_desc
                 self.timer_input = TextInput(
                     label="Timer (seconds, 0 = now, max 3600)",
                     style=TextInputStyle.short,
@@ -153,26 +416,28 @@ async def vc_snapshot_command(interaction: discord.Interaction):
                     required=False,
                     placeholder="0"
                 )
+                self.min_present = TextInput(
+                    label="Only users present at least N minutes",
+                    style=TextInputStyle.short,
+                    required=False,
+                    placeholder="blank = everyone",
+                    max_length=4
+                )
                 self.add_item(self.timer_input)
                 self.add_item(self.limit)
+                self.add_item(self.min_present)
 
             async def on_submit(self, interaction2: discord.Interaction):
-                # Set user limit if provided
+                limit = None
                 if self.limit.value.strip() != "":
                     try:
                         limit = int(self.limit.value)
-                        edited = 0
-                        for vc in self.voice_channels:
-                            await vc.edit(user_limit=limit)
-                            edited += 1
-                        # Don't send a message here, just proceed
-                    except Exception as e:
-                        await interaction2.response.send_message(
-                            f"❌ Error setting user limit: {e}",
-                            ephemeral=True
-                        )
+                    except ValueError:
+                        await interaction2.response.send_message("❌ User limit must be a number.", ephemeral=True)
+                        return
+                    if not 0 <= limit <= 99:
+                        await interaction2.response.send_message("❌ User limit must be between 0 and 99.", ephemeral=True)
                         return
-                # Handle timer and snapshot
                 try:
                     timer = int(self.timer_input.value.strip() or "0")
                 except Exception:
@@ -181,176 +446,69 @@ async def vc_snapshot_command(interaction: discord.Interaction):
                 if timer < 0 or timer > 3600:
                     await interaction2.response.send_message("❌ Timer must be between 0 and 3600 seconds.", ephemeral=True)
                     return
-                responded = False
-                if self.channel:
-                    target_desc = f"Voice Channel: **{self.channel.name}**"
-                else:
-                    target_desc = f"Category: **{self.category.name}**"
+                try:
+                    min_minutes = int(self.min_present.value.strip() or "0")
+                except Exception:
+                    await interaction2.response.send_message("❌ Invalid minimum minutes value.", ephemeral=True)
+                    return
+                # Everything is validated: acknowledge now, before any channel edits
+                await interaction2.response.defer(ephemeral=True, thinking=True)
+                notes = []
+                if limit is not None:
+                    result = await set_user_limits(self.voice_channels, limit)
+                    notes.append(result.summary(f"Set user limit to {limit} for"))
+                post_channel_id = interaction2.channel_id if isinstance(interaction2.channel, discord.TextChannel) else None
                 if timer > 0:
-                    await interaction2.response.send_message(
-                        f"⏳ Timer started for {target_desc}. Snapshot will be posted in {timer} seconds...",
-                        ephemeral=True
+                    job = scheduler.submit("vc_snapshot", interaction2.guild_id, timer, {
+                        "target": self.target,
+                        "post_channel_id": post_channel_id,
+                        "requested_by": interaction2.user.id,
+                        "requested_by_name": interaction2.user.display_name,
+                        "timer": timer,
+                        "min_minutes": min_minutes,
+                    })
+                    notes.append(
+                        f"⏳ Snapshot #{job['id']} scheduled for {self.target_desc} <t:{int(job['due'])}:R>. "
+                        f"Use `/vc_snapshot_cancel` to cancel it."
                     )
-                    responded = True
-                    await asyncio.sleep(timer)
-                else:
-                    await interaction2.response.defer(ephemeral=True, thinking=True)
-                    responded = True
-                if self.channel:
-                    channels = [self.channel]
-                    target_desc = f"Voice Channel: **{self.channel.name}**"
-                else:
-                    channels = [ch for ch in self.category.channels if isinstance(ch, discord.VoiceChannel)]
-                    if not channels:
-                        if responded:
-                            await interaction2.followup.send(f"❌ No voice channels found in category '{self.category.name}'.", ephemeral=True)
-                        else:
-                            await interaction2.response.send_message(f"❌ No voice channels found in category '{self.category.name}'.", ephemeral=True)
-                        return
-                    target_desc = f"Category: **{self.category.name}** ({len(channels)} voice channels)"
-                snapshot_lines = []
-                total_users = 0
-                for vc in channels:
-                    members = [m for m in vc.members if not m.bot]
-                    total_users += len(members)
-                    if members:
-                        user_list = ", ".join(discord.utils.escape_markdown(m.display_name) for m in members)
-                        snapshot_lines.append(f"🔊 **{vc.name}** ({len(members)}): {user_list}")
-                    else:
-                        snapshot_lines.append(f"🔊 **{vc.name}**: *(empty)*")
-                embed = discord.Embed(
-                    title="🔎 VC Snapshot",
-                    description=f"{target_desc}\nTimer: {timer} seconds\nTime: <t:{int(datetime.datetime.now().timestamp())}:f>",
-                    color=discord.Color.blue()
-                )
-                embed.add_field(
-                    name=f"Users Present ({total_users} total)",
-                    value="\n".join(snapshot_lines)[:1024] if snapshot_lines else "No users found.",
-                    inline=False
-                )
-                embed.set_footer(text=f"Requested by {interaction2.user.display_name}")
+                    await interaction2.followup.send("\n".join(notes), ephemeral=True)
+                    return
                 try:
-                    if interaction2.channel and isinstance(interaction2.channel, discord.TextChannel):
-                        msg = await interaction2.channel.send(embed=embed, view=VCSnapshotView(channels))
-                    else:
-                        msg = await interaction2.user.send(embed=embed, view=VCSnapshotView(channels))
+                    destination = interaction2.channel if post_channel_id else interaction2.user
+                    await send_snapshot(destination, self.target, self.voice_channels, self.target_desc, timer, min_minutes, interaction2.user.display_name)
                 except Exception as e:
                     logger.error(f"Failed to send snapshot: {e}")
-                    if responded:
-                        await interaction2.followup.send(f"❌ Failed to send snapshot: {e}", ephemeral=True)
-                    else:
-                        await interaction2.response.send_message(f"❌ Failed to send snapshot: {e}", ephemeral=True)
+                    notes.append(f"❌ Failed to send snapshot: {e}")
+                    await interaction2.followup.send("\n".join(notes), ephemeral=True)
                     return
+                notes.append("✅ VC snapshot posted!")
                 try:
-                    if responded:
-                        await interaction2.followup.send("✅ VC snapshot posted!", ephemeral=True)
-                    else:
-                        await interaction2.response.send_message("✅ VC snapshot posted!", ephemeral=True)
+                    await interaction2.followup.send("\n".join(notes), ephemeral=True)
                 except Exception:
                     pass
 
-        class VCOrCategorySelect(discord.ui.View):
+        async def open_snapshot_modal(interaction2: discord.Interaction, value):
+            channels, target_desc = resolve_snapshot_target(interaction2.guild, value)
+            if channels is None:
+                await interaction2.response.send_message(target_desc, ephemeral=True)
+                return
+            # Show combined modal for timer and user limit
+            await interaction2.response.send_modal(VCSnapshotTimerAndLimitModal(value, channels, target_desc))
+
+        class VCOrCategorySelect(ChannelPickerView):
             def __init__(self, guild):
-                super().__init__(timeout=120)
-                self.selected_channel = None
-                self.selected_category = None
-                self.guild = guild
-                voice_channels = [ch for ch in guild.voice_channels]
-                vc_options = [
-                    discord.SelectOption(label=vc.name, value=f"vc:{vc.id}", description=f"Voice Channel")
-                    for vc in voice_channels
-                ]
-                # Show all categories, even if empty, and allow selection
-                categories = list(guild.categories)
-                cat_options = [
-                    discord.SelectOption(
-                        label=cat.name,
-                        value=f"cat:{cat.id}",
-                        description=f"{len([ch for ch in cat.channels if isinstance(ch, discord.VoiceChannel)])} VCs"
-                    )
-                    for cat in categories
-                ]
-                options = vc_options + cat_options
-                options = sorted(options, key=lambda o: o.label.lower())
-                self.select = discord.ui.Select(
-                    placeholder="Search and select a voice channel or category...",
-                    min_values=1,
-                    max_values=1,
-                    options=options[:25]
-                )
-                self.select.callback = self.select_callback
-                self.add_item(self.select)
+                super().__init__(guild, "voice", "Select a voice channel or category...")
 
-            async def select_callback(self, interaction2: discord.Interaction):
+            async def on_pick(self, interaction2: discord.Interaction, values):
                 try:
-                    value = self.select.values[0]
-                    if value.startswith("vc:"):
-                        self.selected_channel = self.guild.get_channel(int(value[3:]))
-                        self.selected_category = None
-                        channels = [self.selected_channel]
-                        target_desc = f"Voice Channel: **{self.selected_channel.name}**"
-                    elif value.startswith("cat:"):
-                        self.selected_category = self.guild.get_channel(int(value[4:]))
-                        self.selected_channel = None
-                        # Allow empty categories to be selected, but show error if no VCs
-                        channels = [ch for ch in self.selected_category.channels if isinstance(ch, discord.VoiceChannel)]
-                        target_desc = f"Category: **{self.selected_category.name}** ({len(channels)} voice channels)"
-                        if not channels:
-                            await interaction2.response.send_message(f"❌ No voice channels found in category '{self.selected_category.name}'. You must add a voice channel to this category first.", ephemeral=True)
-                            return
-                    else:
-                        await interaction2.response.send_message("❌ Invalid selection.", ephemeral=True)
-                        return
-
-                    # Show combined modal for timer and user limit
-                    await interaction2.response.send_modal(VCSnapshotTimerAndLimitModal(
-                        channels[0] if len(channels) == 1 else None,
-                        self.selected_category if self.selected_category else None,
-                        channels
-                    ))
+                    await open_snapshot_modal(interaction2, values[0])
                 except Exception as e:
-                    logger.error(f"VCOrCategorySelect.select_callback error: {e}")
+                    logger.error(f"VCOrCategorySelect.on_pick error: {e}")
                     await interaction2.response.send_message(f"❌ Error: {e}", ephemeral=True)
 
-        class VCSnapshotView(discord.ui.View):
-            def __init__(self, voice_channels):
-                super().__init__(timeout=300)
-                self.voice_channels = voice_channels
-
-            @discord.ui.button(label="Set User Limit for All", style=discord.ButtonStyle.primary)
-            async def set_limit(self, interaction: discord.Interaction, button: discord.ui.Button):
-                await interaction.response.send_modal(SetLimitModal(self.voice_channels))
-
-        class SetLimitModal(discord.ui.Modal, title="Set User Limit for All VCs"):
-            def __init__(self, voice_channels):
-                super().__init__()
-                self.voice_channels = voice_channels
-                self.limit = TextInput(
-                    label="User limit (0 = unlimited)",
-                    style=TextInputStyle.short,
-                    required=True,
-                    placeholder="0"
-                )
-                self.add_item(self.limit)
-
-            async def on_submit(self, interaction: discord.Interaction):
-                try:
-                    limit = int(self.limit.value)
-                    edited = 0
-                    for vc in self.voice_channels:
-                        await vc.edit(user_limit=limit)
-                        edited += 1
-                    await interaction.response.send_message(
-                        f"✅ Set user limit to {limit} for {edited} voice channels.",
-                        ephemeral=True
-                    )
-                except Exception as e:
-                    await interaction.response.send_message(
-                        f"❌ Error setting user limit: {e}",
-                        ephemeral=True
-                    )
-
-
+        if target:
+            await open_snapshot_modal(interaction, target)
+            return
         view = VCOrCategorySelect(interaction.guild)
         await interaction.response.send_message(
             "🔎 **VC Snapshot**\nSelect a voice channel or a category to snapshot:",
@@ -367,48 +525,14 @@ async def vc_snapshot_command(interaction: discord.Interaction):
         except Exception:
             pass
 
-# In-memory config for move permissions
-move_config = {
-    'role_id': None,
-    'channel_ids': set(),
-    'category_ids': set(),
-}
-
-class MoveSetupView(discord.ui.View):
+class MoveSetupView(ChannelPickerView):
     def __init__(self, guild):
-        super().__init__(timeout=120)
-        self.guild = guild
-        # Voice channels
-        voice_channels = [ch for ch in guild.voice_channels]
-        vc_options = [
-            discord.SelectOption(label=vc.name, value=f"vc:{vc.id}")
-            for vc in voice_channels
-        ]
-        # All categories (not just those with VCs)
-        categories = list(guild.categories)
-        cat_options = [
-            discord.SelectOption(label=cat.name, value=f"cat:{cat.id}")
-            for cat in categories
-        ]
-        options = vc_options + cat_options
-        self.channel_select = discord.ui.Select(
-            placeholder="Select voice channels or categories...",
-            min_values=1,
-            max_values=min(25, len(options)),
-            options=options[:25]
-        )
-        self.channel_select.callback = self.channel_callback
-        self.add_item(self.channel_select)
-        # Role select
-        role_options = [
-            discord.SelectOption(label=role.name, value=str(role.id))
-            for role in guild.roles if not role.is_default()
-        ]
-        self.role_select = discord.ui.Select(
+        super().__init__(guild, "voice", "Select voice channels or categories...", max_values=25)
+        self.role_select = discord.ui.RoleSelect(
             placeholder="Select a role to grant disconnect power...",
             min_values=1,
             max_values=1,
-            options=role_options[:25]
+            row=2
         )
         self.role_select.callback = self.role_callback
         self.add_item(self.role_select)
@@ -417,10 +541,10 @@ class MoveSetupView(discord.ui.View):
         self.selected_role = None
 
 
-    async def channel_callback(self, interaction: discord.Interaction):
+    async def on_pick(self, interaction: discord.Interaction, values):
         self.selected_channels = set()
         self.selected_categories = set()
-        for v in self.channel_select.values:
+        for v in values:
             if v.startswith("vc:"):
                 self.selected_channels.add(int(v[3:]))
             elif v.startswith("cat:"):
@@ -431,98 +555,17 @@ class MoveSetupView(discord.ui.View):
 
 
     async def role_callback(self, interaction: discord.Interaction):
-        self.selected_role = int(self.role_select.values[0])
+        self.selected_role = self.role_select.values[0].id
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
 
-    @discord.ui.button(label="Save Setup", style=discord.ButtonStyle.success)
+    @discord.ui.button(label="Save Setup", style=discord.ButtonStyle.success, row=3)
     async def save(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not self.selected_role or (not self.selected_channels and not self.selected_categories):
             await interaction.response.send_message("Please select at least one channel/category and a role.", ephemeral=True)
             return
-        move_config['role_id'] = self.selected_role
-        move_config['channel_ids'] = self.selected_channels
-        move_config['category_ids'] = self.selected_categories
+        vc_access_config.save(self.guild.id, "disconnect", self.selected_role, self.selected_channels, self.selected_categories)
         await interaction.response.send_message("✅ Disconnect setup saved!", ephemeral=True)
 
-# Slash command for setup
-def setup_vc_move(bot):
-    # This function is now obsolete and replaced by the VoiceCog class method.
-    return
-
-    # Context menu for disconnecting members (global registration)
-    @bot.tree.context_menu(name="Disconnect Member")
-    async def disconnect_member_context(interaction: discord.Interaction, target: discord.Member):
-        # Only allow if config is set
-        if not move_config['role_id']:
-            await interaction.response.send_message("Disconnect setup not configured.", ephemeral=True)
-            return
-        # Only allow if invoker has the role
-        if move_config['role_id'] not in [role.id for role in interaction.user.roles]:
-            await interaction.response.send_message("You do not have the disconnect role.", ephemeral=True)
-            return
-        # Both must be in a voice channel
-        if not interaction.user.voice or not target.voice:
-            await interaction.response.send_message("Both users must be in a voice channel.", ephemeral=True)
-            return
-        user_vc = interaction.user.voice.channel
-        target_vc = target.voice.channel
-        allowed = False
-        # If the user's VC is in the allowed channels, they can disconnect anyone (with any role) in that same VC, but not from other VCs
-        if user_vc.id in move_config['channel_ids'] and user_vc.id == target_vc.id:
-            allowed = True
-        # If the user's VC is in an allowed category, they can disconnect anyone (with any role) in the same VC, but not from other VCs in the category
-        for cat_id in move_config['category_ids']:
-            cat = interaction.guild.get_channel(cat_id)
-            if cat and user_vc in cat.channels and user_vc == target_vc:
-                allowed = True
-        if not allowed:
-            await interaction.response.send_message("You can only disconnect members in the same allowed VC.", ephemeral=True)
-            return
-        # Disconnect the target from VC
-        try:
-            await target.edit(voice_channel=None)
-            await interaction.response.send_message(f"✅ {target.display_name} has been disconnected from the voice channel.", ephemeral=True)
-        except Exception as e:
-            await interaction.response.send_message(f"❌ Failed to disconnect: {e}", ephemeral=True)
-    # (Global sync is handled in on_ready in your main bot file. Do not sync here.)
-
-    # --- NEW: Text command for disconnecting a user by mention ---
-    @bot.event
-    async def on_message(message):
-        if message.author.bot:
-            return
-        if message.content.startswith('!disconnect'):
-            if not move_config['role_id']:
-                await message.channel.send("Disconnect setup not configured.")
-                return
-            if move_config['role_id'] not in [role.id for role in message.author.roles]:
-                await message.channel.send("You do not have the disconnect role.")
-                return
-            if not message.author.voice or not message.mentions:
-                await message.channel.send("You and the mentioned user must both be in a voice channel.")
-                return
-            target = message.mentions[0]
-            if not target.voice:
-                await message.channel.send("The mentioned user is not in a voice channel.")
-                return
-            user_vc = message.author.voice.channel
-            target_vc = target.voice.channel
-            allowed = False
-            if user_vc.id in move_config['channel_ids'] and user_vc.id == target_vc.id:
-                allowed = True
-            for cat_id in move_config['category_ids']:
-                cat = message.guild.get_channel(cat_id)
-                if cat and user_vc in cat.channels and user_vc == target_vc:
-                    allowed = True
-            if not allowed:
-                await message.channel.send("You can only disconnect members in the same allowed VC.")
-                return
-            try:
-                await target.edit(voice_channel=None)
-                await message.channel.send(f"✅ {target.display_name} has been disconnected from the voice channel.")
-            except Exception as e:
-                await message.channel.send(f"❌ Failed to disconnect: {e}")
 async def setup(bot):
     await bot.add_cog(VoiceCog(bot))
-    await bot.add_cog(VoiceCog(bot))
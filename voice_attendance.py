@@ -0,0 +1,396 @@
+import os
+import sys
+import time
+import struct
+import asyncio
+import logging
+from array import array
+import discord
+from discord import app_commands
+from discord.ext import commands
+from bot.utils.helpers import is_mod
+from bot.cogs.channel_picker import channel_autocomplete, parse_channel_target
+
+logger = logging.getLogger(__name__)
+
+# Append-only per-guild event logs live here as <guild_id>.vatt
+ATTENDANCE_DIR = "attendance"
+FLUSH_INTERVAL = 30  # seconds
+BUFFER_CAPACITY = 4096  # events per guild between flushes
+CHECKPOINT_INTERVAL = 3600  # seconds between checkpoint blocks; bounds how much history a query decodes
+
+# Event kinds. RESET closes every open interval: written when the bot (re)connects,
+# because anything that happened while it was offline is unknown. OPEN rows only appear
+# in checkpoint blocks: one per member in voice, with ts = when their interval began.
+JOIN, LEAVE, MOVE, RESET, OPEN = 1, 2, 3, 4, 5
+
+# One block on disk: header, then each column back to back (little-endian).
+# The header carries the block's first and last timestamps so queries can skip blocks
+# without decoding them; for a checkpoint block both are the time it was taken.
+# Files written before timestamps were added hold LEGACY_HEADER blocks, which are always decoded.
+BLOCK_MAGIC = b"VAT2"
+BLOCK_HEADER = struct.Struct("<4sIIIB")  # magic, count, first ts, last ts, flags
+LEGACY_MAGIC = b"VATT"
+LEGACY_HEADER = struct.Struct("<4sI")
+CHECKPOINT = 1  # header flag
+# timestamp (unix seconds), kind, member ID, from channel ID, to channel ID: 29 bytes per event
+COLUMN_TYPES = ("I", "B", "Q", "Q", "Q")
+ROW_SIZE = sum(array(t).itemsize for t in COLUMN_TYPES)
+
+
+class AttendanceBuffer:
+    """Fixed-capacity columnar event buffer for one guild."""
+    __slots__ = ("capacity", "columns", "count")
+
+    def __init__(self, capacity=BUFFER_CAPACITY):
+        self.capacity = capacity
+        self.columns = tuple(array(t, bytes(array(t).itemsize * capacity)) for t in COLUMN_TYPES)
+        self.count = 0
+
+    def append(self, ts, kind, member_id, from_id, to_id):
+        if self.count >= self.capacity:
+            return False
+        i = self.count
+        ts_col, kind_col, member_col, from_col, to_col = self.columns
+        ts_col[i] = ts
+        kind_col[i] = kind
+        member_col[i] = member_id
+        from_col[i] = from_id
+        to_col[i] = to_id
+        self.count += 1
+        return True
+
+    def snapshot(self):
+        """Copies of the filled part of each column."""
+        return tuple(col[:self.count] for col in self.columns)
+
+    def drain(self):
+        columns = self.snapshot()
+        self.count = 0
+        return columns
+
+
+def _encode_block(columns, checkpoint_ts=None):
+    if checkpoint_ts is not None:
+        header = BLOCK_HEADER.pack(BLOCK_MAGIC, len(columns[0]), checkpoint_ts, checkpoint_ts, CHECKPOINT)
+    else:
+        header = BLOCK_HEADER.pack(BLOCK_MAGIC, len(columns[0]), min(columns[0]), max(columns[0]), 0)
+    parts = [header]
+    for col in columns:
+        if sys.byteorder == "big":
+            col = array(col.typecode, col)
+            col.byteswap()
+        parts.append(col.tobytes())
+    return b"".join(parts)
+
+
+def _checkpoint_columns(open_since):
+    """A checkpoint block's columns: an OPEN row per member with an open interval."""
+    rows = [(since, OPEN, member_id, 0, channel_id) for member_id, (channel_id, since) in open_since.items()]
+    return tuple(array(t, col) for t, col in zip(COLUMN_TYPES, zip(*rows) if rows else [()] * len(COLUMN_TYPES)))
+
+
+def _scan_headers(f, path):
+    """(offset of the columns, count, first ts, last ts, flags) for each whole block in the file."""
+    size = os.fstat(f.fileno()).st_size
+    headers = []
+    offset = 0
+    while True:
+        f.seek(offset)
+        magic = f.read(4)
+        if magic == BLOCK_MAGIC:
+            raw = magic + f.read(BLOCK_HEADER.size - 4)
+            if len(raw) < BLOCK_HEADER.size:
+                break
+            _, count, first, last, flags = BLOCK_HEADER.unpack(raw)
+            offset += BLOCK_HEADER.size
+        elif magic == LEGACY_MAGIC:
+            raw = magic + f.read(LEGACY_HEADER.size - 4)
+            if len(raw) < LEGACY_HEADER.size:
+                break
+            _, count = LEGACY_HEADER.unpack(raw)
+            first, last, flags = None, None, 0
+            offset += LEGACY_HEADER.size
+        else:
+            if magic:
+                logger.error(f"Corrupt attendance block in {path}; ignoring the rest of the file")
+            break
+        if offset + count * ROW_SIZE > size:
+            # Torn write at the tail (e.g. crash mid-flush)
+            break
+        headers.append((offset, count, first, last, flags))
+        offset += count * ROW_SIZE
+    return headers
+
+
+def read_blocks(path, start=None, end=None):
+    """Yield the column tuples stored in an attendance file, oldest first.
+
+    With `start`, reading begins at the last checkpoint taken at or before it, since
+    earlier blocks cannot change who was in voice from then on. With `end`, reading
+    stops at the first block that begins after it.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        headers = _scan_headers(f, path)
+        first_block = 0
+        if start is not None:
+            for i, (_, _, first, _, flags) in enumerate(headers):
+                if flags & CHECKPOINT and first <= start:
+                    first_block = i
+        for offset, count, first, _, _ in headers[first_block:]:
+            if end is not None and first is not None and first > end:
+                return
+            f.seek(offset)
+            columns = []
+            for typecode in COLUMN_TYPES:
+                col = array(typecode)
+                col.frombytes(f.read(count * col.itemsize))
+                if sys.byteorder == "big":
+                    col.byteswap()
+                columns.append(col)
+            yield tuple(columns)
+
+
+def presence_totals(blocks, start, end, channel_ids=None):
+    """Seconds each member spent in voice (optionally only in `channel_ids`) between start and end."""
+    open_since = {}  # member_id: (channel_id, since)
+    totals = {}
+
+    def close(member_id, ts):
+        channel_id, since = open_since.pop(member_id)
+        if channel_ids is None or channel_id in channel_ids:
+            overlap = min(ts, end) - max(since, start)
+            if overlap > 0:
+                totals[member_id] = totals.get(member_id, 0) + overlap
+
+    for ts_col, kind_col, member_col, _, to_col in blocks:
+        for ts, kind, member_id, to_id in zip(ts_col, kind_col, member_col, to_col):
+            if ts > end:
+                break
+            if kind == RESET:
+                for open_id in list(open_since):
+                    close(open_id, ts)
+                continue
+            if kind == OPEN:
+                # Checkpoint row: seeds the interval when reading began at this checkpoint
+                open_since.setdefault(member_id, (to_id, ts))
+                continue
+            if member_id in open_since:
+                close(member_id, ts)
+            if kind != LEAVE:
+                open_since[member_id] = (to_id, ts)
+    for member_id in list(open_since):
+        close(member_id, end)
+    return totals
+
+
+class AttendanceRecorder:
+    """Buffers voice join/leave/move events per guild and appends them to columnar files."""
+    def __init__(self, directory=ATTENDANCE_DIR, capacity=BUFFER_CAPACITY):
+        self.directory = directory
+        self.capacity = capacity
+        self._buffers = {}  # guild_id: AttendanceBuffer
+        self._pending = {}  # guild_id: [(column tuple, checkpoint ts or None) drained but not yet on disk]
+        self._open = {}  # guild_id: {member_id: (channel_id, since)}, known once a RESET was recorded
+        self._last_checkpoint = {}  # guild_id: ts
+        self._lock = None  # created on first use, inside the bot's event loop
+
+    def path_for(self, guild_id):
+        return os.path.join(self.directory, f"{guild_id}.vatt")
+
+    def record(self, guild_id, kind, member_id=0, from_id=0, to_id=0, ts=None):
+        ts = int(ts if ts is not None else time.time())
+        buf = self._buffers.get(guild_id)
+        if buf is None:
+            buf = self._buffers[guild_id] = AttendanceBuffer(self.capacity)
+        if not buf.append(ts, kind, member_id, from_id or 0, to_id or 0):
+            # Full before the next flush: park the block and start over
+            self._pending.setdefault(guild_id, []).append((buf.drain(), None))
+            buf.append(ts, kind, member_id, from_id or 0, to_id or 0)
+        self._track(guild_id, ts, kind, member_id, to_id or 0)
+
+    def _track(self, guild_id, ts, kind, member_id, to_id):
+        # Mirrors presence_totals, so checkpoints hold what a full replay would have open
+        if kind == RESET:
+            self._open[guild_id] = {}
+            return
+        open_since = self._open.get(guild_id)
+        if open_since is None:
+            return
+        if kind == LEAVE:
+            open_since.pop(member_id, None)
+        else:
+            open_since[member_id] = (to_id, ts)
+
+    def _write(self, blocks):
+        os.makedirs(self.directory, exist_ok=True)
+        for guild_id, guild_blocks in blocks.items():
+            with open(self.path_for(guild_id), "ab") as f:
+                for columns, checkpoint_ts in guild_blocks:
+                    f.write(_encode_block(columns, checkpoint_ts))
+
+    def _take_unflushed(self):
+        blocks = self._pending
+        self._pending = {}
+        for guild_id, buf in self._buffers.items():
+            if buf.count:
+                blocks.setdefault(guild_id, []).append((buf.drain(), None))
+        now = int(time.time())
+        for guild_id, open_since in self._open.items():
+            if now - self._last_checkpoint.get(guild_id, 0) >= CHECKPOINT_INTERVAL:
+                # Taken after draining, so it reflects every event written before it
+                blocks.setdefault(guild_id, []).append((_checkpoint_columns(open_since), now))
+                self._last_checkpoint[guild_id] = now
+        return blocks
+
+    @property
+    def lock(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def flush(self):
+        async with self.lock:
+            blocks = self._take_unflushed()
+            if not blocks:
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._write, blocks)
+            except Exception as e:
+                logger.error(f"Attendance flush failed: {e}")
+                # Put the blocks back in front of anything recorded meanwhile
+                for guild_id, guild_blocks in blocks.items():
+                    self._pending[guild_id] = guild_blocks + self._pending.get(guild_id, [])
+
+    def flush_now(self):
+        """Blocking flush, for shutdown."""
+        blocks = self._take_unflushed()
+        if blocks:
+            self._write(blocks)
+
+    async def totals(self, guild_id, start, end, channel_ids=None):
+        async with self.lock:
+            unflushed = [columns for columns, _ in self._pending.get(guild_id, [])]
+            buf = self._buffers.get(guild_id)
+            if buf is not None and buf.count:
+                unflushed.append(buf.snapshot())
+            path = self.path_for(guild_id)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                lambda: presence_totals(_chain(read_blocks(path, start, end), unflushed), start, end, channel_ids)
+            )
+
+
+def _chain(*iterables):
+    for it in iterables:
+        yield from it
+
+
+attendance_recorder = AttendanceRecorder()
+
+
+class VoiceAttendanceCog(commands.Cog):
+    """Records voice attendance and answers /vc_attendance."""
+    def __init__(self, bot):
+        self.bot = bot
+        self.flush_task = None
+
+    async def cog_load(self):
+        self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def cog_unload(self):
+        if self.flush_task:
+            self.flush_task.cancel()
+        attendance_recorder.flush_now()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(FLUSH_INTERVAL)
+                await attendance_recorder.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Attendance flush loop error: {e}")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        now = time.time()
+        for guild in self.bot.guilds:
+            attendance_recorder.record(guild.id, RESET, ts=now)
+            for channel in list(guild.voice_channels) + list(guild.stage_channels):
+                for member in channel.members:
+                    if not member.bot:
+                        attendance_recorder.record(guild.id, JOIN, member.id, 0, channel.id, ts=now)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if member.bot or before.channel == after.channel:
+            return
+        if before.channel is None:
+            attendance_recorder.record(member.guild.id, JOIN, member.id, 0, after.channel.id)
+        elif after.channel is None:
+            attendance_recorder.record(member.guild.id, LEAVE, member.id, before.channel.id, 0)
+        else:
+            attendance_recorder.record(member.guild.id, MOVE, member.id, before.channel.id, after.channel.id)
+
+    @app_commands.command(name="vc_attendance", description="Show how long each member was in voice over a recent time window.")
+    @app_commands.describe(
+        minutes="Look back this many minutes (default 120)",
+        target="Only count time in this voice channel or category",
+        min_minutes="Only list members present at least this many minutes"
+    )
+    @app_commands.autocomplete(target=channel_autocomplete("voice"))
+    async def vc_attendance(self, interaction: discord.Interaction, minutes: app_commands.Range[int, 1, 10080] = 120,
+                            target: str = None, min_minutes: app_commands.Range[int, 0, 10080] = 0):
+        if not is_mod(interaction):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+        channel_ids = None
+        target_desc = "All voice channels"
+        if target:
+            parsed = parse_channel_target(target)
+            if parsed is None:
+                await interaction.response.send_message("❌ Invalid selection.", ephemeral=True)
+                return
+            kind, channel_id = parsed
+            if kind == "vc":
+                # The channel may be gone; its attendance is still on record
+                channel = interaction.guild.get_channel(channel_id)
+                channel_ids = {channel_id}
+                target_desc = f"Voice Channel: **{channel.name if channel else channel_id}**"
+            else:
+                category = interaction.guild.get_channel(channel_id)
+                if not isinstance(category, discord.CategoryChannel):
+                    await interaction.response.send_message("❌ Category not found.", ephemeral=True)
+                    return
+                channel_ids = {ch.id for ch in category.channels}
+                target_desc = f"Category: **{category.name}**"
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        end = time.time()
+        start = end - minutes * 60
+        totals = await attendance_recorder.totals(interaction.guild.id, start, end, channel_ids)
+        rows = sorted(((secs, mid) for mid, secs in totals.items() if secs >= min_minutes * 60), reverse=True)
+        lines = []
+        length = 0
+        for secs, member_id in rows:
+            line = f"<@{member_id}> — {secs / 60:.1f} min"
+            if length + len(line) + 1 > 3900:
+                lines.append(f"... and {len(rows) - len(lines)} more")
+                break
+            lines.append(line)
+            length += len(line) + 1
+        embed = discord.Embed(
+            title="📋 VC Attendance",
+            description=f"{target_desc}\nWindow: <t:{int(start)}:f> → <t:{int(end)}:f>\n\n" + ("\n".join(lines) if lines else "No attendance recorded."),
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"{len(rows)} members")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(VoiceAttendanceCog(bot))
@@ -0,0 +1,127 @@
+import time
+import logging
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
+
+class VoicePresenceIndex:
+    """Who is in which voice channel right now, and since when.
+
+    Maintained incrementally from voice state events so snapshots read a few dicts
+    instead of rebuilding `vc.members` (which scans every voice state in the guild)
+    for each channel. Bots are never indexed.
+    """
+    def __init__(self):
+        self._channels = {}  # channel_id: {member_id: joined_at (unix seconds)}
+        self._member_channel = {}  # (guild_id, member_id): channel_id
+        self._guilds = set()  # guild IDs that have been seeded from the cache
+
+    def is_tracking(self, guild_id):
+        return guild_id in self._guilds
+
+    def join(self, guild_id, channel_id, member_id, joined_at=None):
+        key = (guild_id, member_id)
+        current = self._member_channel.get(key)
+        if current == channel_id:
+            return
+        if current is not None:
+            self._remove(current, member_id)
+        self._member_channel[key] = channel_id
+        self._channels.setdefault(channel_id, {})[member_id] = joined_at if joined_at is not None else time.time()
+
+    def leave(self, guild_id, member_id):
+        channel_id = self._member_channel.pop((guild_id, member_id), None)
+        if channel_id is not None:
+            self._remove(channel_id, member_id)
+        return channel_id
+
+    def _remove(self, channel_id, member_id):
+        members = self._channels.get(channel_id)
+        if members is not None:
+            members.pop(member_id, None)
+            if not members:
+                del self._channels[channel_id]
+
+    def members(self, channel_id):
+        """{member_id: joined_at} for one channel (do not mutate)."""
+        return self._channels.get(channel_id, {})
+
+    def present_since(self, channel_ids, min_seconds, now=None):
+        """{channel_id: [member_id, ...]} of members who have been in the channel at least `min_seconds`."""
+        cutoff = (now if now is not None else time.time()) - min_seconds
+        return {
+            cid: [mid for mid, joined_at in self.members(cid).items() if joined_at <= cutoff]
+            for cid in channel_ids
+        }
+
+    def seed_guild(self, guild):
+        """(Re)build a guild's entries from the voice cache, keeping join times of members who stayed put."""
+        previous = {
+            mid: (cid, self._channels[cid][mid])
+            for (gid, mid), cid in self._member_channel.items() if gid == guild.id
+        }
+        self.drop_guild(guild.id)
+        now = time.time()
+        for channel in list(guild.voice_channels) + list(guild.stage_channels):
+            for member in channel.members:
+                if member.bot:
+                    continue
+                prev = previous.get(member.id)
+                joined_at = prev[1] if prev and prev[0] == channel.id else now
+                self.join(guild.id, channel.id, member.id, joined_at)
+        self._guilds.add(guild.id)
+
+    def drop_guild(self, guild_id):
+        self._guilds.discard(guild_id)
+        for key in [k for k in self._member_channel if k[0] == guild_id]:
+            self.leave(*key)
+
+    def drop_channel(self, guild_id, channel_id):
+        for member_id in list(self.members(channel_id)):
+            self.leave(guild_id, member_id)
+
+
+voice_presence = VoicePresenceIndex()
+
+
+class VoicePresenceCog(commands.Cog):
+    """Feeds the voice presence index from gateway events."""
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        if self.bot.is_ready():
+            for guild in self.bot.guilds:
+                voice_presence.seed_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Also runs after a reconnect, when voice events may have been missed
+        for guild in self.bot.guilds:
+            voice_presence.seed_guild(guild)
+        logger.info(f"Voice presence index seeded for {len(self.bot.guilds)} guilds")
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        voice_presence.seed_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        voice_presence.drop_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        voice_presence.drop_channel(channel.guild.id, channel.id)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if member.bot or before.channel == after.channel:
+            return
+        if after.channel is None:
+            voice_presence.leave(member.guild.id, member.id)
+        else:
+            voice_presence.join(member.guild.id, after.channel.id, member.id)
+
+async def setup(bot):
+    await bot.add_cog(VoicePresenceCog(bot))